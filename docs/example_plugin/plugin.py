@@ -24,7 +24,6 @@ This plugin demonstrates the basic plugin API and provides:
 
 import gi
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, GLib
 from plugin_api import PluginBase, TerminalPlugin, UIPlugin, hook
 
 class ExamplePlugin(PluginBase, TerminalPlugin, UIPlugin):
@@ -45,6 +44,8 @@ class ExamplePlugin(PluginBase, TerminalPlugin, UIPlugin):
 
         # Show welcome message if configured
         if self.config.get("show_welcome", True):
+            # GTK modules are imported where used to keep plugin loading cheap
+            from gi.repository import GLib
             GLib.timeout_add(1000, self._show_welcome_message)
 
     def on_unload(self):
@@ -102,6 +103,7 @@ class ExamplePlugin(PluginBase, TerminalPlugin, UIPlugin):
 
     def _on_example_action(self):
         """Handle example plugin action."""
+        from gi.repository import Gtk
         dialog = Gtk.MessageDialog(
             parent=None,  # Would need main window reference
             flags=0,
@@ -115,6 +117,7 @@ class ExamplePlugin(PluginBase, TerminalPlugin, UIPlugin):
 
     def _on_plugin_settings(self):
         """Show plugin settings dialog."""
+        from gi.repository import Gtk
         dialog = Gtk.MessageDialog(
             parent=None,  # Would need main window reference
             flags=0,
@@ -1,3 +1,4 @@
+"""
 NewTerm Configuration Module
 
 Copyright (C) 2024 NewTerm Team
@@ -16,177 +17,226 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import copy
 import json
 import os
 import shutil
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parsed config files shared process-wide, keyed by path and revalidated
+# against (mtime_ns, size) so an unchanged file is never parsed twice.
+_CONFIG_CACHE = {}
+
+def _flatten(tree, prefix=""):
+    """Yield (dotted_key, value) for every node of a nested config dict."""
+    for k, v in tree.items():
+        key = prefix + k
+        yield key, v
+        if isinstance(v, dict):
+            yield from _flatten(v, key + ".")
+
+_DEFAULT_CONFIG = {
+    "ui_theme": "Default",
+    "theme": {
+        "background_color": "#000000",
+        "foreground_color": "#FFFFFF",
+        "cursor_color": "#FFFFFF",
+        "palette": [
+            "#000000", "#800000", "#008000", "#808000",
+            "#000080", "#800080", "#008080", "#C0C0C0",
+            "#808080", "#FF0000", "#00FF00", "#FFFF00",
+            "#0000FF", "#FF00FF", "#00FFFF", "#FFFFFF"
+        ]
+    },
+    "ui_themes": {
+        "Default": {
+            "menu_bar_bg": "#F5F5F5",
+            "menu_bar_fg": "#000000",
+            "menu_item_bg": "#FFFFFF",
+            "menu_item_fg": "#000000",
+            "menu_item_hover_bg": "#E0E0E0",
+            "menu_item_hover_fg": "#000000",
+            "tab_bar_bg": "#E8E8E8",
+            "tab_bg": "#D0D0D0",
+            "tab_fg": "#000000",
+            "tab_active_bg": "#FFFFFF",
+            "tab_active_fg": "#000000",
+            "tab_hover_bg": "#C0C0C0",
+            "tab_hover_fg": "#000000",
+            "button_bg": "#E0E0E0",
+            "button_fg": "#000000",
+            "window_bg": "#FFFFFF"
+        },
+        "Dark": {
+            "menu_bar_bg": "#2D2D2D",
+            "menu_bar_fg": "#FFFFFF",
+            "menu_item_bg": "#3C3C3C",
+            "menu_item_fg": "#FFFFFF",
+            "menu_item_hover_bg": "#4A4A4A",
+            "menu_item_hover_fg": "#FFFFFF",
+            "tab_bar_bg": "#2D2D2D",
+            "tab_bg": "#3C3C3C",
+            "tab_fg": "#FFFFFF",
+            "tab_active_bg": "#4A4A4A",
+            "tab_active_fg": "#FFFFFF",
+            "tab_hover_bg": "#555555",
+            "tab_hover_fg": "#FFFFFF",
+            "button_bg": "#4A4A4A",
+            "button_fg": "#FFFFFF",
+            "window_bg": "#2D2D2D"
+        },
+        "OLED": {
+            "menu_bar_bg": "#000000",
+            "menu_bar_fg": "#FFFFFF",
+            "menu_item_bg": "#0A0A0A",
+            "menu_item_fg": "#FFFFFF",
+            "menu_item_hover_bg": "#1A1A1A",
+            "menu_item_hover_fg": "#FFFFFF",
+            "tab_bar_bg": "#000000",
+            "tab_bg": "#0A0A0A",
+            "tab_fg": "#CCCCCC",
+            "tab_active_bg": "#1A1A1A",
+            "tab_active_fg": "#FFFFFF",
+            "tab_hover_bg": "#2A2A2A",
+            "tab_hover_fg": "#FFFFFF",
+            "button_bg": "#1A1A1A",
+            "button_fg": "#FFFFFF",
+            "window_bg": "#000000"
+        }
+    },
+    "font": {
+        "family": "Monospace",
+        "size": 12
+    },
+    "keybindings": {
+        "copy": "<Ctrl><Shift>C",
+        "paste": "<Ctrl><Shift>V",
+        "new_tab": "<Ctrl><Shift>T",
+        "close_tab": "<Ctrl><Shift>W",
+        "next_tab": "<Ctrl>Page_Down",
+        "prev_tab": "<Ctrl>Page_Up",
+        "split_horizontal": "<Ctrl><Alt>H",
+        "split_vertical": "<Ctrl><Alt>V",
+        "close_pane": "<Ctrl><Alt>Q",
+        "zoom_in": "<Ctrl>plus",
+        "zoom_out": "<Ctrl>minus",
+        "reset_zoom": "<Ctrl>0",
+        "find": "<Ctrl><Shift>F",
+        "command_palette": "<Ctrl><Shift>P",
+        "preferences": "<Ctrl>comma",
+        "toggle_fullscreen": "F11",
+        "new_window": "<Ctrl><Shift>N",
+        "quit": "<Ctrl><Alt>Q",
+        "scroll_up": "<Ctrl><Shift>Up",
+        "scroll_down": "<Ctrl><Shift>Down",
+        "scroll_to_top": "<Ctrl>Home",
+        "scroll_to_bottom": "<Ctrl>End",
+        "page_up": "Page_Up",
+        "page_down": "Page_Down",
+        "select_all": "<Ctrl><Shift>A",
+        "select_word": "<Ctrl><Alt>W",
+        "select_line": "<Ctrl><Shift>L",
+        "clear_selection": "Escape",
+        "split_pane_h": "<Ctrl><Alt>H",
+        "split_pane_v": "<Ctrl><Alt>V"
+    },
+    "scrollback_lines": 1000,
+    "gpu_acceleration": True,
+    "restore_session": True,
+    "show_menu_bar": True,
+    "show_status_bar": False,
+    "auto_save_session": True,
+    "audible_bell": False,
+    "urgent_bell": True,
+    "mouse_autohide": False,
+    "debug_mode": False,
+    "log_commands": False,
+    "plugins": {
+        "enabled": [],
+        "disabled": [],
+        "auto_load": True
+    },
+    "session": {
+        "max_tabs": 10,
+        "save_on_exit": True,
+        "restore_on_start": True
+    },
+    "performance": {
+        "max_scrollback": 10000,
+        "terminal_bell": True,
+        "cursor_blink": True,
+        "cursor_shape": "block"
+    }
+}
+
 class Config:
     def __init__(self, config_path=None):
         if config_path is None:
             config_dir = os.path.expanduser("~/.config/newterm")
             os.makedirs(config_dir, exist_ok=True)
             self.config_path = os.path.join(config_dir, "config.json")
-            # Copy default if not exists
-            if not os.path.exists(self.config_path):
-                default_path = os.path.join(os.path.dirname(__file__), "..", "config.json")
-                if os.path.exists(default_path):
-                    shutil.copy(default_path, self.config_path)
+            # Copy default if not exists ('x' mode never clobbers a user config)
+            default_path = os.path.join(os.path.dirname(__file__), "..", "config.json")
+            try:
+                with open(default_path, 'rb') as src, open(self.config_path, 'xb') as dst:
+                    shutil.copyfileobj(src, dst)
+            except (FileNotFoundError, FileExistsError):
+                pass
         else:
             self.config_path = config_path
-        self.config = self.load_config()
+        self._config = None
+        self._flat = None
+
+    @property
+    def config(self):
+        # Parsed on first access so short-lived users never touch the file
+        if self._config is None:
+            self._config = self.load_config()
+        return self._config
+
+    @config.setter
+    def config(self, value):
+        self._config = value
+        self._flat = None
 
     def load_config(self):
-        if os.path.exists(self.config_path):
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
-        else:
+        try:
+            st = os.stat(self.config_path)
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = _CONFIG_CACHE.get(self.config_path)
+            # Callers get their own copy; the cached dict is never handed out
+            if cached is not None and cached[0] == stamp:
+                return copy.deepcopy(cached[1])
+            with open(self.config_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
             return self.get_default_config()
+        if orjson is not None:
+            config = orjson.loads(data)
+        else:
+            config = json.loads(data)
+        _CONFIG_CACHE[self.config_path] = (stamp, config)
+        return copy.deepcopy(config)
 
     def get_default_config(self):
-        return {
-            "ui_theme": "Default",
-            "theme": {
-                "background_color": "#000000",
-                "foreground_color": "#FFFFFF",
-                "cursor_color": "#FFFFFF",
-                "palette": [
-                    "#000000", "#800000", "#008000", "#808000",
-                    "#000080", "#800080", "#008080", "#C0C0C0",
-                    "#808080", "#FF0000", "#00FF00", "#FFFF00",
-                    "#0000FF", "#FF00FF", "#00FFFF", "#FFFFFF"
-                ]
-            },
-            "ui_themes": {
-                "Default": {
-                    "menu_bar_bg": "#F5F5F5",
-                    "menu_bar_fg": "#000000",
-                    "menu_item_bg": "#FFFFFF",
-                    "menu_item_fg": "#000000",
-                    "menu_item_hover_bg": "#E0E0E0",
-                    "menu_item_hover_fg": "#000000",
-                    "tab_bar_bg": "#E8E8E8",
-                    "tab_bg": "#D0D0D0",
-                    "tab_fg": "#000000",
-                    "tab_active_bg": "#FFFFFF",
-                    "tab_active_fg": "#000000",
-                    "tab_hover_bg": "#C0C0C0",
-                    "tab_hover_fg": "#000000",
-                    "button_bg": "#E0E0E0",
-                    "button_fg": "#000000",
-                    "window_bg": "#FFFFFF"
-                },
-                "Dark": {
-                    "menu_bar_bg": "#2D2D2D",
-                    "menu_bar_fg": "#FFFFFF",
-                    "menu_item_bg": "#3C3C3C",
-                    "menu_item_fg": "#FFFFFF",
-                    "menu_item_hover_bg": "#4A4A4A",
-                    "menu_item_hover_fg": "#FFFFFF",
-                    "tab_bar_bg": "#2D2D2D",
-                    "tab_bg": "#3C3C3C",
-                    "tab_fg": "#FFFFFF",
-                    "tab_active_bg": "#4A4A4A",
-                    "tab_active_fg": "#FFFFFF",
-                    "tab_hover_bg": "#555555",
-                    "tab_hover_fg": "#FFFFFF",
-                    "button_bg": "#4A4A4A",
-                    "button_fg": "#FFFFFF",
-                    "window_bg": "#2D2D2D"
-                },
-                "OLED": {
-                    "menu_bar_bg": "#000000",
-                    "menu_bar_fg": "#FFFFFF",
-                    "menu_item_bg": "#0A0A0A",
-                    "menu_item_fg": "#FFFFFF",
-                    "menu_item_hover_bg": "#1A1A1A",
-                    "menu_item_hover_fg": "#FFFFFF",
-                    "tab_bar_bg": "#000000",
-                    "tab_bg": "#0A0A0A",
-                    "tab_fg": "#CCCCCC",
-                    "tab_active_bg": "#1A1A1A",
-                    "tab_active_fg": "#FFFFFF",
-                    "tab_hover_bg": "#2A2A2A",
-                    "tab_hover_fg": "#FFFFFF",
-                    "button_bg": "#1A1A1A",
-                    "button_fg": "#FFFFFF",
-                    "window_bg": "#000000"
-                }
-            },
-            "font": {
-                "family": "Monospace",
-                "size": 12
-            },
-            "keybindings": {
-                "copy": "<Ctrl><Shift>C",
-                "paste": "<Ctrl><Shift>V",
-                "new_tab": "<Ctrl><Shift>T",
-                "close_tab": "<Ctrl><Shift>W",
-                "next_tab": "<Ctrl>Page_Down",
-                "prev_tab": "<Ctrl>Page_Up",
-                "split_horizontal": "<Ctrl><Alt>H",
-                "split_vertical": "<Ctrl><Alt>V",
-                "close_pane": "<Ctrl><Alt>Q",
-                "zoom_in": "<Ctrl>plus",
-                "zoom_out": "<Ctrl>minus",
-                "reset_zoom": "<Ctrl>0",
-                "find": "<Ctrl><Shift>F",
-                "command_palette": "<Ctrl><Shift>P",
-                "preferences": "<Ctrl>comma",
-                "toggle_fullscreen": "F11",
-                "new_window": "<Ctrl><Shift>N",
-                "quit": "<Ctrl><Alt>Q",
-                "scroll_up": "<Ctrl><Shift>Up",
-                "scroll_down": "<Ctrl><Shift>Down",
-                "scroll_to_top": "<Ctrl>Home",
-                "scroll_to_bottom": "<Ctrl>End",
-                "page_up": "Page_Up",
-                "page_down": "Page_Down",
-                "select_all": "<Ctrl><Shift>A",
-                "select_word": "<Ctrl><Alt>W",
-                "select_line": "<Ctrl><Shift>L",
-                "clear_selection": "Escape",
-                "split_pane_h": "<Ctrl><Alt>H",
-                "split_pane_v": "<Ctrl><Alt>V"
-            },
-            "scrollback_lines": 1000,
-            "gpu_acceleration": True,
-            "restore_session": True,
-            "show_menu_bar": True,
-            "show_status_bar": False,
-            "auto_save_session": True,
-            "audible_bell": False,
-            "urgent_bell": True,
-            "mouse_autohide": False,
-            "debug_mode": False,
-            "log_commands": False,
-            "plugins": {
-                "enabled": [],
-                "disabled": [],
-                "auto_load": True
-            },
-            "session": {
-                "max_tabs": 10,
-                "save_on_exit": True,
-                "restore_on_start": True
-            },
-            "performance": {
-                "max_scrollback": 10000,
-                "terminal_bell": True,
-                "cursor_blink": True,
-                "cursor_shape": "block"
-            }
-        }
+        return copy.deepcopy(_DEFAULT_CONFIG)
 
     def save_config(self):
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        self._flat = None
+        if orjson is not None:
+            data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(self.config, indent=2).encode('utf-8')
+        with open(self.config_path, 'wb') as f:
+            f.write(data)
+        st = os.stat(self.config_path)
+        _CONFIG_CACHE[self.config_path] = ((st.st_mtime_ns, st.st_size), copy.deepcopy(self.config))
 
     def get(self, key, default=None):
-        keys = key.split('.')
-        value = self.config
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        return value
+        if self._flat is None:
+            self._flat = dict(_flatten(self.config))
+        return self._flat.get(key, default)
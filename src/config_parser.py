@@ -17,178 +17,192 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import io
 import re
 import os
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Union
+
+# Classifies a whole line in one pass; the last group to match names its kind.
+# A trailing '{' opens a section even if the line also contains '='.
+_LINE_RE = re.compile(r"""
+    \s*(?:
+        (?P<comment>\#.*?)
+      | (?P<close>\}.*?)
+      | (?P<open>.*?)\s*\{
+      | (?P<key>[^=]*?)\s*=\s*(?P<value>.*?)
+      | (?P<blank>)
+    )\s*
+""", re.VERBOSE)
+
+_ARRAY_SPLIT_RE = re.compile(r'\s*,\s*')
+_QUOTES = ('"', "'")
+
+def _format_diagnostic(lineno: Optional[int], detail: str) -> str:
+    """Render a (lineno, detail) diagnostic recorded during parsing."""
+    if lineno is None:
+        return detail
+    return f"Line {lineno}: {detail}"
 
 class ConfigParser:
     """Parser for custom configuration language with graceful error handling."""
 
     def __init__(self):
         self.line_number = 0
+        # Diagnostics are (lineno, detail) pairs, formatted by the getters
         self.errors = []
         self.warnings = []
 
-    def parse(self, content: str) -> Dict[str, Any]:
-        """Parse configuration content into a dictionary."""
+    def parse(self, content: Union[str, Iterable[str]]) -> Dict[str, Any]:
+        """Parse configuration content (a string or iterable of lines) into a dictionary."""
         self.line_number = 0
-        self.errors = []
-        self.warnings = []
+        self.errors.clear()
+        self.warnings.clear()
 
-        if not content.strip():
-            return {}
+        if isinstance(content, str):
+            if not content.strip():
+                return {}
+            content = io.StringIO(content)
 
         try:
             return self._parse_content(content)
         except Exception as e:
-            self.errors.append(f"Parse error: {str(e)}")
+            self.errors.append((None, f"Parse error: {str(e)}"))
             return {}
 
-    def _parse_content(self, content: str) -> Dict[str, Any]:
+    def _parse_content(self, lines: Iterable[str]) -> Dict[str, Any]:
         """Main parsing logic."""
         config = {}
-        lines = content.split('\n')
-
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            self.line_number = i + 1
+        # Innermost open section is last; sections may nest without recursion
+        stack = [config]
 
-            if not line or line.startswith('#'):
-                i += 1
-                continue
+        lineno = 0
+        for lineno, line in enumerate(lines, 1):
+            match = _LINE_RE.fullmatch(line)
+            kind = match.lastgroup if match else None
 
-            if line.startswith('}') or line.endswith('{'):
-                # Handle section endings and beginnings
-                i += 1
-                continue
-
-            # Parse key-value pairs or sections
-            if '=' in line and not line.endswith('{'):
-                key, value = self._parse_key_value(line)
+            if kind == 'value':
+                key, value = self._parse_key_value(match.group('key'), match.group('value'), lineno)
                 if key:
-                    config[key] = value
-                i += 1
-            elif line.endswith('{'):
-                # Parse section
-                section_name = line[:-1].strip()
-                section_content, new_i = self._parse_section(lines, i + 1)
-                config[section_name] = section_content
-                i = new_i
-            else:
-                self.warnings.append(f"Line {self.line_number}: Unrecognized syntax: {line}")
-                i += 1
-
+                    stack[-1][key] = value
+            elif kind == 'open':
+                section = {}
+                stack[-1][match.group('open')] = section
+                stack.append(section)
+            elif kind == 'close':
+                if len(stack) > 1:
+                    stack.pop()
+                # Stray section endings at the top level are skipped
+            elif kind is None:
+                where = " in section" if len(stack) > 1 else ""
+                self.warnings.append((lineno, f"Unrecognized syntax{where}: {line.strip()}"))
+            # Blank lines and comments are skipped
+
+        self.line_number = lineno
         return config
 
-    def _parse_key_value(self, line: str) -> tuple[Optional[str], Any]:
-        """Parse a key=value line."""
+    def _parse_key_value(self, key: str, value_part: str, lineno: int) -> tuple[Optional[str], Any]:
+        """Parse the key and raw value of a key=value line."""
         try:
-            if '=' not in line:
-                return None, None
-
-            key, value_part = line.split('=', 1)
-            key = key.strip()
-            value_part = value_part.strip()
-
-            # Handle different value types
-            if value_part.lower() in ('true', 'false'):
-                return key, value_part.lower() == 'true'
-            elif value_part.startswith('[') and value_part.endswith(']'):
-                return key, self._parse_array(value_part)
-            elif value_part.startswith('"') and value_part.endswith('"'):
-                return key, value_part[1:-1]
-            elif self._is_number(value_part):
-                return key, self._parse_number(value_part)
-            else:
+            # Dispatch on the first character of the value
+            parser = _VALUE_PARSERS.get(value_part[:1])
+            if parser is None:
                 return key, value_part
+            return key, parser(self, value_part)
         except Exception as e:
-            self.errors.append(f"Line {self.line_number}: Error parsing '{line}': {str(e)}")
+            self.errors.append((lineno, f"Error parsing '{key} = {value_part}': {str(e)}"))
             return None, None
 
-    def _parse_array(self, array_str: str) -> List[str]:
+    def _parse_bool(self, value: str) -> Union[bool, str]:
+        """Parse true/false (case-insensitive), otherwise keep the string."""
+        lowered = value.lower()
+        if lowered == 'true':
+            return True
+        if lowered == 'false':
+            return False
+        return value
+
+    def _parse_quoted(self, value: str) -> str:
+        """Strip the double quotes from a quoted string."""
+        if value.endswith('"'):
+            return value[1:-1]
+        return value
+
+    def _parse_array(self, array_str: str) -> Union[List[str], str]:
         """Parse array syntax [item1, item2, item3]."""
+        if not array_str.endswith(']'):
+            return array_str
         try:
             # Remove brackets
             inner = array_str[1:-1].strip()
             if not inner:
                 return []
 
-            # Split by comma and clean up
-            items = [item.strip().strip('"\'') for item in inner.split(',')]
-            return [item for item in items if item]  # Remove empty items
+            # Split by comma (swallowing surrounding whitespace) and unquote
+            items = []
+            for item in _ARRAY_SPLIT_RE.split(inner):
+                if item[:1] in _QUOTES and item[-1:] == item[:1]:
+                    item = item[1:-1]
+                if item:  # Remove empty items
+                    items.append(item)
+            return items
         except Exception:
             return []
 
-    def _parse_number(self, value: str) -> Union[int, float]:
-        """Parse numeric values."""
+    def _parse_number(self, value: str) -> Union[int, float, str]:
+        """Parse numeric values in a single pass, falling back to the raw string."""
         try:
-            if '.' in value:
-                return float(value)
-            else:
-                return int(value)
+            return int(value)
         except ValueError:
-            return value  # Return as string if not a valid number
-
-    def _is_number(self, value: str) -> bool:
-        """Check if string represents a number."""
+            pass
         try:
-            float(value)
-            return True
+            return float(value)
         except ValueError:
-            return False
-
-    def _parse_section(self, lines: List[str], start_i: int) -> tuple[Dict[str, Any], int]:
-        """Parse a section block."""
-        section_config = {}
-        i = start_i
-
-        while i < len(lines):
-            line = lines[i].strip()
-            self.line_number = i + 1
-
-            if line == '}' or (line.startswith('}') and line.endswith('}')):
-                return section_config, i + 1
-
-            if not line or line.startswith('#'):
-                i += 1
-                continue
-
-            if '=' in line:
-                key, value = self._parse_key_value(line)
-                if key:
-                    section_config[key] = value
-                i += 1
-            else:
-                self.warnings.append(f"Line {self.line_number}: Unrecognized syntax in section: {line}")
-                i += 1
-
-        return section_config, i
+            return value  # Return as string if not a valid number
 
     def get_errors(self) -> List[str]:
         """Get parsing errors."""
-        return self.errors.copy()
+        return [_format_diagnostic(lineno, detail) for lineno, detail in self.errors]
 
     def get_warnings(self) -> List[str]:
         """Get parsing warnings."""
-        return self.warnings.copy()
+        return [_format_diagnostic(lineno, detail) for lineno, detail in self.warnings]
+
+# Value parsers keyed by the first character of the raw value
+_VALUE_PARSERS = {
+    't': ConfigParser._parse_bool,
+    'T': ConfigParser._parse_bool,
+    'f': ConfigParser._parse_bool,
+    'F': ConfigParser._parse_bool,
+    '[': ConfigParser._parse_array,
+    '"': ConfigParser._parse_quoted,
+}
+_VALUE_PARSERS.update(dict.fromkeys('0123456789+-.', ConfigParser._parse_number))
+
+# One reusable parser per thread; parse() resets its diagnostics in place
+_PARSER_POOL = threading.local()
+
+def _get_parser() -> ConfigParser:
+    """Get this thread's shared ConfigParser, creating it on first use."""
+    parser = getattr(_PARSER_POOL, 'parser', None)
+    if parser is None:
+        parser = _PARSER_POOL.parser = ConfigParser()
+    return parser
 
 def parse_config_file(file_path: str) -> Dict[str, Any]:
     """Parse a configuration file."""
-    if not os.path.exists(file_path):
-        return {}
-
     try:
+        parser = _get_parser()
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        parser = ConfigParser()
-        config = parser.parse(content)
+            config = parser.parse(f)
 
         # Log warnings but don't fail
         for warning in parser.get_warnings():
             print(f"Config warning: {warning}")
 
         return config
+    except FileNotFoundError:
+        return {}
     except Exception as e:
         print(f"Error reading config file {file_path}: {e}")
         return {}
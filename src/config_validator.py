@@ -17,7 +17,190 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from typing import Dict, Any, List, Optional, Union
+import copy
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+# Shared immutable palette; deepcopy returns the same tuple object
+_DEFAULT_PALETTE: Tuple[str, ...] = (
+    "#000000", "#800000", "#008000", "#808000",
+    "#000080", "#800080", "#008080", "#C0C0C0",
+    "#808080", "#FF0000", "#00FF00", "#FFFF00",
+    "#0000FF", "#FF00FF", "#00FFFF", "#FFFFFF"
+)
+
+# Built once at import; get_default_config() hands out deep copies
+_DEFAULT_CONFIG_TEMPLATE = {
+    "theme": {
+        "background_color": "#000000",
+        "foreground_color": "#FFFFFF",
+        "cursor_color": "#FFFFFF",
+        "palette": _DEFAULT_PALETTE
+    },
+    "font": {
+        "family": "Monospace",
+        "size": 12
+    },
+    "keybindings": {
+        "copy": "<Ctrl><Shift>C",
+        "paste": "<Ctrl><Shift>V",
+        "new_tab": "<Ctrl><Shift>T",
+        "close_tab": "<Ctrl><Shift>W",
+        "next_tab": "<Ctrl>Page_Down",
+        "prev_tab": "<Ctrl>Page_Up",
+        "split_horizontal": "<Ctrl><Alt>H",
+        "split_vertical": "<Ctrl><Alt>V",
+        "close_pane": "<Ctrl><Alt>Q",
+        "zoom_in": "<Ctrl>plus",
+        "zoom_out": "<Ctrl>minus",
+        "reset_zoom": "<Ctrl>0",
+        "find": "<Ctrl><Shift>F",
+        "command_palette": "<Ctrl><Shift>P",
+        "preferences": "<Ctrl>comma",
+        "toggle_fullscreen": "F11",
+        "new_window": "<Ctrl><Shift>N",
+        "quit": "<Ctrl><Alt>Q",
+        "scroll_up": "<Ctrl><Shift>Up",
+        "scroll_down": "<Ctrl><Shift>Down",
+        "scroll_to_top": "<Ctrl>Home",
+        "scroll_to_bottom": "<Ctrl>End",
+        "page_up": "Page_Up",
+        "page_down": "Page_Down",
+        "select_all": "<Ctrl><Shift>A",
+        "select_word": "<Ctrl><Alt>W",
+        "select_line": "<Ctrl><Shift>L",
+        "clear_selection": "Escape",
+        "split_pane_h": "<Ctrl><Alt>H",
+        "split_pane_v": "<Ctrl><Alt>V"
+    },
+    "scrollback_lines": 1000,
+    "gpu_acceleration": True,
+    "restore_session": True,
+    "show_menu_bar": True,
+    "show_status_bar": False,
+    "auto_save_session": True,
+    "audible_bell": False,
+    "urgent_bell": True,
+    "mouse_autohide": False,
+    "debug_mode": False,
+    "log_commands": False,
+    "plugins": {
+        "enabled": [],
+        "disabled": [],
+        "auto_load": True
+    },
+    "session": {
+        "max_tabs": 10,
+        "save_on_exit": True,
+        "restore_on_start": True
+    },
+    "performance": {
+        "max_scrollback": 10000,
+        "terminal_bell": True,
+        "cursor_blink": True,
+        "cursor_shape": "block"
+    }
+}
+
+def _nested_paths(tree: Dict[str, Any], prefix: Tuple[str, ...] = ()) -> frozenset:
+    """Collect the key paths of every non-empty dict in the default tree."""
+    paths = set()
+    for key, value in tree.items():
+        if value and isinstance(value, dict):
+            path = prefix + (key,)
+            paths.add(path)
+            paths.update(_nested_paths(value, path))
+    return frozenset(paths)
+
+# Paths _merge_config descends into rather than replacing wholesale
+_NESTED_PATHS = _nested_paths(_DEFAULT_CONFIG_TEMPLATE)
+
+_HEX_COLOR = {"type": "string", "pattern": "^#([0-9A-Fa-f]{3}|[0-9A-Fa-f]{6})$"}
+_BOOLEAN = {"type": "boolean"}
+_NAME_LIST = {"type": "array", "items": {"type": "string"}}
+
+# Mirrors the per-field checks below: a config accepted by this schema would
+# not produce any warning from them.
+_CONFIG_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "theme": {
+            "type": "object",
+            "properties": {
+                "background_color": _HEX_COLOR,
+                "foreground_color": _HEX_COLOR,
+                "cursor_color": _HEX_COLOR,
+                "palette": {"type": "array", "items": _HEX_COLOR, "minItems": 16, "maxItems": 16}
+            }
+        },
+        "font": {
+            "type": "object",
+            "properties": {
+                "size": {"type": "number", "exclusiveMinimum": 0},
+                "family": {"type": "string", "pattern": "\\S"}
+            }
+        },
+        "keybindings": {
+            "type": "object",
+            "additionalProperties": {"type": "string", "pattern": "\\S"}
+        },
+        "scrollback_lines": {"type": "integer", "minimum": 0},
+        "gpu_acceleration": _BOOLEAN,
+        "session": {
+            "type": "object",
+            "properties": {
+                "max_tabs": {"type": "integer", "minimum": 1, "maximum": 50},
+                "save_on_exit": _BOOLEAN,
+                "restore_on_start": _BOOLEAN
+            }
+        },
+        "plugins": {
+            "type": "object",
+            "properties": {
+                "auto_load": _BOOLEAN,
+                "enabled": _NAME_LIST,
+                "disabled": _NAME_LIST
+            }
+        },
+        "performance": {
+            "type": "object",
+            "properties": {
+                "max_scrollback": {"type": "integer", "minimum": 100, "maximum": 1000000},
+                "terminal_bell": _BOOLEAN,
+                "cursor_blink": _BOOLEAN,
+                "cursor_shape": {"enum": ["block", "ibeam", "underline"]}
+            }
+        }
+    }
+}
+
+# Compiled once at import when fastjsonschema is installed
+_FAST_VALIDATE = fastjsonschema.compile(_CONFIG_SCHEMA) if fastjsonschema else None
+
+# Byte lookup table: 1 for hex digits, 0 for everything else
+_HEX_OK = bytes(1 if c in b'0123456789abcdefABCDEF' else 0 for c in range(256))
+
+@lru_cache(maxsize=512)
+def _is_hex_color(color: str) -> bool:
+    """Check a color string against #RGB/#RRGGBB; palettes repeat, so cache it."""
+    if not color.isascii():
+        return False
+    b = color.encode('ascii')
+    n = len(b)
+    if n != 4 and n != 7:
+        return False
+    if b[0] != 0x23:  # '#'
+        return False
+    tbl = _HEX_OK
+    return all(tbl[c] for c in b[1:])
 
 class ConfigValidator:
     """Validates configuration values with graceful error handling."""
@@ -25,98 +208,47 @@ class ConfigValidator:
     def __init__(self):
         self.errors = []
         self.warnings = []
+        # (digest of the last user config, its validated config, warnings);
+        # only the latest config is ever looked up again
+        self._last: Optional[Tuple[bytes, Dict[str, Any], tuple]] = None
 
     @staticmethod
     def get_default_config() -> Dict[str, Any]:
         """Get the default configuration structure."""
-        return {
-            "theme": {
-                "background_color": "#000000",
-                "foreground_color": "#FFFFFF",
-                "cursor_color": "#FFFFFF",
-                "palette": [
-                    "#000000", "#800000", "#008000", "#808000",
-                    "#000080", "#800080", "#008080", "#C0C0C0",
-                    "#808080", "#FF0000", "#00FF00", "#FFFF00",
-                    "#0000FF", "#FF00FF", "#00FFFF", "#FFFFFF"
-                ]
-            },
-            "font": {
-                "family": "Monospace",
-                "size": 12
-            },
-            "keybindings": {
-                "copy": "<Ctrl><Shift>C",
-                "paste": "<Ctrl><Shift>V",
-                "new_tab": "<Ctrl><Shift>T",
-                "close_tab": "<Ctrl><Shift>W",
-                "next_tab": "<Ctrl>Page_Down",
-                "prev_tab": "<Ctrl>Page_Up",
-                "split_horizontal": "<Ctrl><Alt>H",
-                "split_vertical": "<Ctrl><Alt>V",
-                "close_pane": "<Ctrl><Alt>Q",
-                "zoom_in": "<Ctrl>plus",
-                "zoom_out": "<Ctrl>minus",
-                "reset_zoom": "<Ctrl>0",
-                "find": "<Ctrl><Shift>F",
-                "command_palette": "<Ctrl><Shift>P",
-                "preferences": "<Ctrl>comma",
-                "toggle_fullscreen": "F11",
-                "new_window": "<Ctrl><Shift>N",
-                "quit": "<Ctrl><Alt>Q",
-                "scroll_up": "<Ctrl><Shift>Up",
-                "scroll_down": "<Ctrl><Shift>Down",
-                "scroll_to_top": "<Ctrl>Home",
-                "scroll_to_bottom": "<Ctrl>End",
-                "page_up": "Page_Up",
-                "page_down": "Page_Down",
-                "select_all": "<Ctrl><Shift>A",
-                "select_word": "<Ctrl><Alt>W",
-                "select_line": "<Ctrl><Shift>L",
-                "clear_selection": "Escape",
-                "split_pane_h": "<Ctrl><Alt>H",
-                "split_pane_v": "<Ctrl><Alt>V"
-            },
-            "scrollback_lines": 1000,
-            "gpu_acceleration": True,
-            "restore_session": True,
-            "show_menu_bar": True,
-            "show_status_bar": False,
-            "auto_save_session": True,
-            "audible_bell": False,
-            "urgent_bell": True,
-            "mouse_autohide": False,
-            "debug_mode": False,
-            "log_commands": False,
-            "plugins": {
-                "enabled": [],
-                "disabled": [],
-                "auto_load": True
-            },
-            "session": {
-                "max_tabs": 10,
-                "save_on_exit": True,
-                "restore_on_start": True
-            },
-            "performance": {
-                "max_scrollback": 10000,
-                "terminal_bell": True,
-                "cursor_blink": True,
-                "cursor_shape": "block"
-            }
-        }
+        return copy.deepcopy(_DEFAULT_CONFIG_TEMPLATE)
 
     def validate(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Validate configuration and merge with defaults gracefully."""
-        self.errors = []
-        self.warnings = []
+        self.errors.clear()
+        self.warnings.clear()
+
+        # An unchanged config (e.g. a no-op reload) reuses the earlier result
+        key = hashlib.blake2b(
+            json.dumps(config, sort_keys=True, default=str).encode(),
+            digest_size=16
+        ).digest()
+        last = self._last
+        if last is not None and last[0] == key:
+            self.warnings.extend(last[2])
+            return copy.deepcopy(last[1])
+
+        validated_config = self._merge_and_check(config)
+        self._last = (key, copy.deepcopy(validated_config), tuple(self.warnings))
+        return validated_config
 
+    def _merge_and_check(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge config into the defaults and record warnings for bad values."""
         # Start with defaults
         validated_config = self.get_default_config()
 
         # Merge user config, but only override if values are explicitly set
         self._merge_config(validated_config, config)
 
+        # Clean configs pass the compiled schema; the per-field checks only
+        # run to describe what is wrong
+        if self._passes_schema(validated_config):
+            return validated_config
+
         # Validate critical values
         self._validate_theme(validated_config.get('theme', {}))
         self._validate_font(validated_config.get('font', {}))
@@ -129,23 +261,44 @@ class ConfigValidator:
 
         return validated_config
 
+    def _passes_schema(self, config: Dict[str, Any]) -> bool:
+        """Check config against the compiled schema, if available."""
+        if _FAST_VALIDATE is None:
+            return False
+
+        try:
+            _FAST_VALIDATE(config)
+        except fastjsonschema.JsonSchemaException:
+            return False
+
+        # JSON Schema accepts 5.0 as an integer; the field checks do not
+        integers = (
+            config.get('scrollback_lines', 0),
+            config.get('session', {}).get('max_tabs', 1),
+            config.get('performance', {}).get('max_scrollback', 100)
+        )
+        return all(isinstance(value, int) for value in integers)
+
     def _merge_config(self, defaults: Dict[str, Any], user_config: Dict[str, Any]):
         """Merge user config into defaults, only overriding explicitly set values."""
-        for key, value in user_config.items():
-            if key in defaults:
-                if isinstance(defaults[key], dict) and isinstance(value, dict):
-                    # Recursively merge nested dictionaries
-                    if not defaults[key]:  # If defaults is empty dict, replace entirely
-                        defaults[key] = value
-                    else:
-                        self._merge_config(defaults[key], value)
-                else:
-                    # For non-dict values, only override if user provided a non-None value
-                    if value is not None:
-                        defaults[key] = value
-            else:
-                # Add new keys that aren't in defaults
-                defaults[key] = value
+        # defaults is always a fresh copy of the template, so which of its
+        # nodes are dicts is known up front from _NESTED_PATHS.
+        nested = _NESTED_PATHS
+        stack = [(defaults, user_config, ())]
+        while stack:
+            target, source, prefix = stack.pop()
+            for key, value in source.items():
+                if key not in target:
+                    # Add new keys that aren't in defaults
+                    target[key] = value
+                    continue
+                path = prefix + (key,)
+                if path in nested and isinstance(value, dict):
+                    # Merge nested dictionaries (an empty default is replaced entirely)
+                    stack.append((target[key], value, path))
+                elif value is not None:
+                    # Only override if user provided a non-None value
+                    target[key] = value
 
     def _validate_theme(self, theme: Dict[str, Any]):
         """Validate theme configuration."""
@@ -162,7 +315,7 @@ class ConfigValidator:
         # Validate palette
         if 'palette' in theme:
             palette = theme['palette']
-            if isinstance(palette, list):
+            if isinstance(palette, (list, tuple)):
                 if len(palette) != 16:
                     self.warnings.append(f"Palette should have 16 colors, got {len(palette)}")
                 for i, color in enumerate(palette):
@@ -237,7 +390,7 @@ class ConfigValidator:
 
         if 'enabled' in plugins:
             enabled = plugins['enabled']
-            if not isinstance(enabled, list):
+            if not isinstance(enabled, (list, tuple)):
                 self.warnings.append("enabled should be a list of plugin names")
             else:
                 for plugin_name in enabled:
@@ -246,7 +399,7 @@ class ConfigValidator:
 
         if 'disabled' in plugins:
             disabled = plugins['disabled']
-            if not isinstance(disabled, list):
+            if not isinstance(disabled, (list, tuple)):
                 self.warnings.append("disabled should be a list of plugin names")
             else:
                 for plugin_name in disabled:
@@ -280,37 +433,35 @@ class ConfigValidator:
                 self.warnings.append(f"cursor_shape should be one of {valid_shapes}, got: {cursor_shape}")
 
     def _is_valid_color(self, color) -> bool:
-        """Check if a color string is valid."""
-        if not isinstance(color, str):
-            return False
+        """Check if a color string is valid (#RRGGBB or #RGB)."""
+        return isinstance(color, str) and _is_hex_color(color)
 
-        # Check hex color format (#RRGGBB or #RGB)
-        if color.startswith('#'):
-            color = color[1:]
-            if len(color) in (3, 6):
-                try:
-                    int(color, 16)
-                    return True
-                except ValueError:
-                    pass
-
-        return False
-
-    def get_errors(self) -> List[str]:
+    def get_errors(self) -> Tuple[str, ...]:
         """Get validation errors (critical issues)."""
-        return self.errors.copy()
+        return tuple(self.errors)
 
-    def get_warnings(self) -> List[str]:
+    def get_warnings(self) -> Tuple[str, ...]:
         """Get validation warnings (non-critical issues)."""
-        return self.warnings.copy()
+        return tuple(self.warnings)
+
+# One shared validator per thread, so its result cache persists across calls
+_VALIDATOR_POOL = threading.local()
+
+def _get_validator() -> ConfigValidator:
+    """Get this thread's shared ConfigValidator, creating it on first use."""
+    validator = getattr(_VALIDATOR_POOL, 'validator', None)
+    if validator is None:
+        validator = _VALIDATOR_POOL.validator = ConfigValidator()
+    return validator
 
 def validate_config(config: Dict[str, Any]) -> Dict[str, Any]:
     """Validate a configuration dictionary."""
-    validator = ConfigValidator()
+    validator = _get_validator()
     validated = validator.validate(config)
 
-    # Print warnings but don't fail
-    for warning in validator.get_warnings():
-        print(f"Config warning: {warning}")
+    # Print warnings but don't fail; one joined write instead of one per line
+    if validator.warnings:
+        print("\n".join(f"Config warning: {warning}" for warning in validator.warnings),
+              flush=True)
 
     return validated
@@ -19,14 +19,70 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import gi
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk, GLib
-from typing import Dict, Any, Callable, Optional, List, Tuple
+from typing import Dict, Any, Callable, Optional, List, Mapping, Tuple, TYPE_CHECKING
+from functools import lru_cache
+from types import MappingProxyType
+from array import array
 import json
 import os
+import weakref
+
+if TYPE_CHECKING:
+    from gi.repository import Gtk, Gdk
+
+# GTK itself is imported lazily inside the functions that need it, so
+# headless users of this module never load the typelibs.
+
+@lru_cache(maxsize=256)
+def _parse_accel_cached(key_combo: str) -> Tuple[int, 'Gdk.ModifierType']:
+    """Parse an accelerator string once per process."""
+    from gi.repository import Gtk
+    key, mod = Gtk.accelerator_parse(key_combo)
+    return key, mod
+
+# Built once at import and shared read-only by every manager
+_DEFAULT_BINDINGS = MappingProxyType({
+    "terminal": {
+        "copy": {"key": "<Ctrl><Shift>C", "description": "Copy selected text"},
+        "paste": {"key": "<Ctrl><Shift>V", "description": "Paste from clipboard"},
+        "new_tab": {"key": "<Ctrl><Shift>T", "description": "Open new tab"},
+        "close_tab": {"key": "<Ctrl><Shift>W", "description": "Close current tab"},
+        "next_tab": {"key": "<Ctrl>Page_Down", "description": "Next tab"},
+        "prev_tab": {"key": "<Ctrl>Page_Up", "description": "Previous tab"},
+        "split_horizontal": {"key": "<Ctrl><Shift>H", "description": "Split horizontally"},
+        "split_vertical": {"key": "<Ctrl><Shift>V", "description": "Split vertically"},
+        "close_pane": {"key": "<Ctrl><Shift>Q", "description": "Close current pane"},
+        "zoom_in": {"key": "<Ctrl>plus", "description": "Increase font size"},
+        "zoom_out": {"key": "<Ctrl>minus", "description": "Decrease font size"},
+        "reset_zoom": {"key": "<Ctrl>0", "description": "Reset font size"},
+        "find": {"key": "<Ctrl><Shift>F", "description": "Find in terminal"},
+        "command_palette": {"key": "<Ctrl><Shift>P", "description": "Command palette"},
+        "preferences": {"key": "<Ctrl>comma", "description": "Open preferences"},
+        "toggle_fullscreen": {"key": "F11", "description": "Toggle fullscreen"},
+        "new_window": {"key": "<Ctrl><Shift>N", "description": "New window"},
+        "quit": {"key": "<Ctrl><Shift>Q", "description": "Quit application"}
+    },
+    "navigation": {
+        "scroll_up": {"key": "<Ctrl><Shift>Up", "description": "Scroll up one page"},
+        "scroll_down": {"key": "<Ctrl><Shift>Down", "description": "Scroll down one page"},
+        "scroll_to_top": {"key": "<Ctrl>Home", "description": "Scroll to top"},
+        "scroll_to_bottom": {"key": "<Ctrl>End", "description": "Scroll to bottom"},
+        "page_up": {"key": "Page_Up", "description": "Page up"},
+        "page_down": {"key": "Page_Down", "description": "Page down"}
+    },
+    "selection": {
+        "select_all": {"key": "<Ctrl><Shift>A", "description": "Select all"},
+        "select_word": {"key": "<Ctrl><Shift>W", "description": "Select word"},
+        "select_line": {"key": "<Ctrl><Shift>L", "description": "Select line"},
+        "clear_selection": {"key": "Escape", "description": "Clear selection"}
+    }
+})
 
 class KeyBinding:
     """Represents a single keybinding with action and description."""
 
+    __slots__ = ('key_combo', 'action', 'callback', 'description', 'category', 'accelerator')
+
     def __init__(self, key_combo: str, action: str, callback: Callable,
                  description: str = "", category: str = "General"):
         self.key_combo = key_combo
@@ -36,11 +92,10 @@ class KeyBinding:
         self.category = category
         self.accelerator = self._parse_accelerator(key_combo)
 
-    def _parse_accelerator(self, key_combo: str) -> Tuple[int, Gdk.ModifierType]:
+    def _parse_accelerator(self, key_combo: str) -> Tuple[int, 'Gdk.ModifierType']:
         """Parse key combination string into accelerator components."""
         try:
-            key, mod = Gtk.accelerator_parse(key_combo)
-            return key, mod
+            return _parse_accel_cached(key_combo)
         except Exception as e:
             print(f"Error parsing keybinding '{key_combo}': {e}")
             return 0, 0
@@ -49,6 +104,12 @@ class KeyBinding:
         """Check if the keybinding is valid."""
         return self.accelerator[0] != 0
 
+    def activate(self, *args) -> bool:
+        """Accel group handler; reads callback at press time so it can be set later."""
+        if self.callback:
+            return self.callback()
+        return False
+
 class KeyBindingManager:
     """Manages all keybindings for the terminal application."""
 
@@ -57,45 +118,23 @@ class KeyBindingManager:
         self.categories: Dict[str, List[str]] = {}
         self.default_bindings = self._get_default_bindings()
         self.conflicts: List[Tuple[str, str]] = []
-
-    def _get_default_bindings(self) -> Dict[str, Dict[str, Any]]:
+        # Parsed accelerator -> action owning it, for O(1) conflict checks
+        self._accel_index: Dict[Tuple[int, 'Gdk.ModifierType'], str] = {}
+        # Hot parallel arrays walked by connect_to_window; action -> slot
+        self._slots: Dict[str, int] = {}
+        self._slot_actions: List[str] = []
+        self._accel_keys = array('I')
+        self._accel_mods = array('I')
+        self._accel_handlers: List[Callable] = []
+        # Accel group per connected window; entries vanish with the window
+        self._accel_groups: 'weakref.WeakKeyDictionary[Gtk.Window, Gtk.AccelGroup]' = \
+            weakref.WeakKeyDictionary()
+        # Accelerators dropped or replaced by the last load_from_config
+        self._replaced_accels: Dict[str, Tuple[int, 'Gdk.ModifierType']] = {}
+
+    def _get_default_bindings(self) -> Mapping[str, Dict[str, Any]]:
         """Get default keybindings configuration."""
-        return {
-            "terminal": {
-                "copy": {"key": "<Ctrl><Shift>C", "description": "Copy selected text"},
-                "paste": {"key": "<Ctrl><Shift>V", "description": "Paste from clipboard"},
-                "new_tab": {"key": "<Ctrl><Shift>T", "description": "Open new tab"},
-                "close_tab": {"key": "<Ctrl><Shift>W", "description": "Close current tab"},
-                "next_tab": {"key": "<Ctrl>Page_Down", "description": "Next tab"},
-                "prev_tab": {"key": "<Ctrl>Page_Up", "description": "Previous tab"},
-                "split_horizontal": {"key": "<Ctrl><Shift>H", "description": "Split horizontally"},
-                "split_vertical": {"key": "<Ctrl><Shift>V", "description": "Split vertically"},
-                "close_pane": {"key": "<Ctrl><Shift>Q", "description": "Close current pane"},
-                "zoom_in": {"key": "<Ctrl>plus", "description": "Increase font size"},
-                "zoom_out": {"key": "<Ctrl>minus", "description": "Decrease font size"},
-                "reset_zoom": {"key": "<Ctrl>0", "description": "Reset font size"},
-                "find": {"key": "<Ctrl><Shift>F", "description": "Find in terminal"},
-                "command_palette": {"key": "<Ctrl><Shift>P", "description": "Command palette"},
-                "preferences": {"key": "<Ctrl>comma", "description": "Open preferences"},
-                "toggle_fullscreen": {"key": "F11", "description": "Toggle fullscreen"},
-                "new_window": {"key": "<Ctrl><Shift>N", "description": "New window"},
-                "quit": {"key": "<Ctrl><Shift>Q", "description": "Quit application"}
-            },
-            "navigation": {
-                "scroll_up": {"key": "<Ctrl><Shift>Up", "description": "Scroll up one page"},
-                "scroll_down": {"key": "<Ctrl><Shift>Down", "description": "Scroll down one page"},
-                "scroll_to_top": {"key": "<Ctrl>Home", "description": "Scroll to top"},
-                "scroll_to_bottom": {"key": "<Ctrl>End", "description": "Scroll to bottom"},
-                "page_up": {"key": "Page_Up", "description": "Page up"},
-                "page_down": {"key": "Page_Down", "description": "Page down"}
-            },
-            "selection": {
-                "select_all": {"key": "<Ctrl><Shift>A", "description": "Select all"},
-                "select_word": {"key": "<Ctrl><Shift>W", "description": "Select word"},
-                "select_line": {"key": "<Ctrl><Shift>L", "description": "Select line"},
-                "clear_selection": {"key": "Escape", "description": "Clear selection"}
-            }
-        }
+        return _DEFAULT_BINDINGS
 
     def register_binding(self, action: str, key_combo: str, callback: Callable,
                         description: str = "", category: str = "General") -> bool:
@@ -107,14 +146,19 @@ class KeyBindingManager:
             return False
 
         # Check for conflicts
-        for existing_action, existing_binding in self.bindings.items():
-            if (existing_binding.accelerator == binding.accelerator and
-                existing_action != action):
-                self.conflicts.append((action, existing_action))
-                print(f"Keybinding conflict: {action} conflicts with {existing_action}")
-                return False
+        existing_action = self._accel_index.get(binding.accelerator)
+        if existing_action is not None and existing_action != action:
+            self.conflicts.append((action, existing_action))
+            print(f"Keybinding conflict: {action} conflicts with {existing_action}")
+            return False
+
+        previous = self.bindings.get(action)
+        if previous is not None and self._accel_index.get(previous.accelerator) == action:
+            del self._accel_index[previous.accelerator]
 
         self.bindings[action] = binding
+        self._accel_index[binding.accelerator] = action
+        self._store_slot(action, binding)
 
         # Organize by category
         if category not in self.categories:
@@ -129,6 +173,9 @@ class KeyBindingManager:
         if action in self.bindings:
             binding = self.bindings[action]
             del self.bindings[action]
+            if self._accel_index.get(binding.accelerator) == action:
+                del self._accel_index[binding.accelerator]
+            self._drop_slot(action)
 
             # Remove from category
             if binding.category in self.categories:
@@ -138,6 +185,51 @@ class KeyBindingManager:
             return True
         return False
 
+    def _store_slot(self, action: str, binding: KeyBinding) -> None:
+        """Write a binding's accelerator and handler into the hot arrays."""
+        key, mod = binding.accelerator
+        slot = self._slots.get(action)
+        if slot is None:
+            self._slots[action] = len(self._slot_actions)
+            self._slot_actions.append(action)
+            self._accel_keys.append(key)
+            self._accel_mods.append(int(mod))
+            self._accel_handlers.append(binding.activate)
+        else:
+            self._accel_keys[slot] = key
+            self._accel_mods[slot] = int(mod)
+            self._accel_handlers[slot] = binding.activate
+
+    def _drop_slot(self, action: str) -> None:
+        """Remove an action from the hot arrays by swapping in the last slot."""
+        slot = self._slots.pop(action, None)
+        if slot is None:
+            return
+        last = len(self._slot_actions) - 1
+        if slot != last:
+            moved = self._slot_actions[last]
+            self._slot_actions[slot] = moved
+            self._accel_keys[slot] = self._accel_keys[last]
+            self._accel_mods[slot] = self._accel_mods[last]
+            self._accel_handlers[slot] = self._accel_handlers[last]
+            self._slots[moved] = slot
+        self._slot_actions.pop()
+        self._accel_keys.pop()
+        self._accel_mods.pop()
+        self._accel_handlers.pop()
+
+    def _clear_all(self) -> None:
+        """Drop every binding and its lookup structures."""
+        self.bindings.clear()
+        self.categories.clear()
+        self.conflicts.clear()
+        self._accel_index.clear()
+        self._slots.clear()
+        self._slot_actions.clear()
+        del self._accel_keys[:]
+        del self._accel_mods[:]
+        self._accel_handlers.clear()
+
     def get_binding(self, action: str) -> Optional[KeyBinding]:
         """Get a keybinding by action name."""
         return self.bindings.get(action)
@@ -150,54 +242,79 @@ class KeyBindingManager:
         return [self.bindings[action] for action in self.categories[category]
                 if action in self.bindings]
 
-    def load_from_config(self, config: Dict[str, Any]) -> None:
-        """Load keybindings from configuration."""
-        self.bindings.clear()
-        self.categories.clear()
-        self.conflicts.clear()
+    def load_from_config(self, config: Dict[str, Any]) -> Tuple[List[str], List[str], List[str]]:
+        """Load keybindings from configuration; return (added, removed, changed) actions."""
+        previous = self.bindings.copy()
+        self._clear_all()
 
-        # Load default bindings first
+        # Register each default action once, with the user's key if overridden
+        user_bindings = config.get("keybindings", {})
         for category, actions in self.default_bindings.items():
             for action, details in actions.items():
                 # We'll set callbacks later when connecting to UI
                 self.register_binding(
                     action,
-                    details["key"],
+                    user_bindings.get(action, details["key"]),
                     lambda: None,  # Placeholder callback
                     details["description"],
                     category
                 )
 
-        # Override with user config
-        user_bindings = config.get("keybindings", {})
-        for action, key_combo in user_bindings.items():
-            if action in self.bindings:
-                # Update existing binding
-                self.bindings[action].key_combo = key_combo
-                self.bindings[action].accelerator = self.bindings[action]._parse_accelerator(key_combo)
+        added, removed, changed = [], [], []
+        self._replaced_accels = {}
+        for action, old in previous.items():
+            binding = self.bindings.get(action)
+            if binding is None:
+                removed.append(action)
+                self._replaced_accels[action] = old.accelerator
+            elif binding.accelerator != old.accelerator:
+                changed.append(action)
+                self._replaced_accels[action] = old.accelerator
+            else:
+                # Connected accelerators still call the old binding's activate
+                binding.callback = old.callback
+        for action in self.bindings:
+            if action not in previous:
+                added.append(action)
+        return added, removed, changed
+
+    def apply_delta(self, window: 'Gtk.Window', added: List[str],
+                    removed: List[str], changed: List[str]) -> None:
+        """Update every connected window's accelerators after load_from_config."""
+        from gi.repository import Gtk
+
+        # The bindings are shared by all windows, and _replaced_accels only
+        # describes the last load, so every window is brought up to date now
+        flags = Gtk.AccelFlags.VISIBLE
+        for accel_group in list(self._accel_groups.values()):
+            for action in removed + changed:
+                key, mod = self._replaced_accels[action]
+                accel_group.disconnect_key(key, mod)
+
+            for action in added + changed:
+                binding = self.bindings[action]
+                key, mod = binding.accelerator
+                accel_group.connect(key, mod, flags, binding.activate)
+
+        # A window that was never connected gets the full current set
+        if window not in self._accel_groups:
+            self.connect_to_window(window, None)
 
-    def connect_to_window(self, window: Gtk.Window, terminal) -> None:
+    def connect_to_window(self, window: 'Gtk.Window', terminal) -> None:
         """Connect all keybindings to a GTK window."""
+        from gi.repository import Gtk, Gdk
+
         # Create accel group if it doesn't exist
-        if not hasattr(window, 'accel_group'):
-            window.accel_group = Gtk.AccelGroup()
-            window.add_accel_group(window.accel_group)
-
-        # Define action callbacks
-        def create_callback(action_name):
-            def callback():
-                binding = self.get_binding(action_name)
-                if binding and binding.callback:
-                    return binding.callback()
-                return False
-            return callback
-
-        # Connect all bindings
-        for action, binding in self.bindings.items():
-            if binding.is_valid():
-                key, mod = binding.accelerator
-                callback = create_callback(action)
-                window.accel_group.connect(key, mod, Gtk.AccelFlags.VISIBLE, callback)
+        accel_group = self._accel_groups.get(window)
+        if accel_group is None:
+            accel_group = Gtk.AccelGroup()
+            window.add_accel_group(accel_group)
+            self._accel_groups[window] = accel_group
+
+        # Only valid bindings are ever stored, so walk the hot arrays directly
+        flags = Gtk.AccelFlags.VISIBLE
+        for key, mod, handler in zip(self._accel_keys, self._accel_mods, self._accel_handlers):
+            accel_group.connect(key, Gdk.ModifierType(mod), flags, handler)
 
     def get_all_bindings(self) -> Dict[str, KeyBinding]:
         """Get all registered bindings."""
@@ -213,9 +330,7 @@ class KeyBindingManager:
 
     def reset_to_defaults(self) -> None:
         """Reset all bindings to defaults."""
-        self.bindings.clear()
-        self.categories.clear()
-        self.conflicts.clear()
+        self._clear_all()
 
         for category, actions in self.default_bindings.items():
             for action, details in actions.items():
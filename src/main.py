@@ -22,9 +22,12 @@ gi.require_version('Gtk', '3.0')
 gi.require_version('Vte', '2.91')
 gi.require_version('Pango', '1.0')
 from gi.repository import Gtk, Vte, GLib, Gdk, Pango
+import copy
 import os
 import sys
 import signal
+import logging
+from collections import ChainMap
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from config import Config
@@ -34,25 +37,186 @@ from plugin_manager import PluginManager
 from preferences_dialog import PreferencesDialog
 from session_manager import SessionManager
 
+# Startup diagnostics; silent unless the application configures logging
+logger = logging.getLogger("newterm")
+logger.addHandler(logging.NullHandler())
+
+_CONFIG_SINGLETON = None
+_KEYBINDING_MANAGER_SINGLETON = None
+_PLUGIN_MANAGER_SINGLETON = None
+
+def get_config():
+    """Get the process-wide Config, loading it on first use."""
+    global _CONFIG_SINGLETON
+    if _CONFIG_SINGLETON is None:
+        _CONFIG_SINGLETON = Config()
+    return _CONFIG_SINGLETON
+
+def get_keybinding_manager():
+    """Get the process-wide KeyBindingManager, loaded from the config."""
+    global _KEYBINDING_MANAGER_SINGLETON
+    if _KEYBINDING_MANAGER_SINGLETON is None:
+        _KEYBINDING_MANAGER_SINGLETON = KeyBindingManager()
+        _KEYBINDING_MANAGER_SINGLETON.load_from_config(get_config().config)
+    return _KEYBINDING_MANAGER_SINGLETON
+
+def get_plugin_manager():
+    """Get the process-wide PluginManager, discovering plugins once."""
+    global _PLUGIN_MANAGER_SINGLETON
+    if _PLUGIN_MANAGER_SINGLETON is None:
+        _PLUGIN_MANAGER_SINGLETON = PluginManager()
+        # Plugins are imported from idle callbacks after the first paint
+        # (or on demand by the first event they might hook)
+        _PLUGIN_MANAGER_SINGLETON.defer_plugins(_PLUGIN_MANAGER_SINGLETON.discover_plugins())
+    return _PLUGIN_MANAGER_SINGLETON
+
+# Top-level menus as (label, entries); an entry is (label, handler name)
+# or None for a separator
+_MENU_SPEC = (
+    ("File", (
+        ("New Tab", "on_new_tab"),
+        ("New Window", "on_new_window"),
+        None,
+        ("Close Tab", "on_close_tab"),
+        None,
+        ("Quit", "on_quit"),
+    )),
+    ("Edit", (
+        ("Copy", "on_copy"),
+        ("Paste", "on_paste"),
+        None,
+        ("Select All", "on_select_all"),
+    )),
+    ("View", (
+        ("Toggle Fullscreen", "on_toggle_fullscreen"),
+    )),
+    ("Tools", (
+        ("Command Palette", "on_command_palette"),
+    )),
+    ("Preferences", (
+        ("Settings", "on_preferences"),
+    )),
+    ("Help", (
+        ("About", "on_about"),
+    )),
+)
+
+# Menu that receives plugin-contributed items
+_PLUGIN_MENU = "Preferences"
+
+# Shared handler for plugin menu items without a callback
+_NOOP = lambda *_a, **_kw: None
+
+# UI theme stylesheet; placeholders are filled from the theme colors,
+# falling back to _CSS_DEFAULTS
+_CSS_TEMPLATE = """
+/* Menu bar styling */
+.menubar {{
+    background-color: {menu_bar_bg};
+    color: {menu_bar_fg};
+    border-bottom: 1px solid {tab_bar_bg};
+}}
+
+/* Menu items */
+.menubar menuitem {{
+    background-color: {menu_item_bg};
+    color: {menu_item_fg};
+}}
+
+.menubar menuitem:hover {{
+    background-color: {menu_item_hover_bg};
+    color: {menu_item_hover_fg};
+}}
+
+/* Notebook tabs */
+.notebook tab {{
+    background-color: {tab_bg};
+    color: {tab_fg};
+    padding: 4px 8px;
+    border: 1px solid {tab_bar_bg};
+    border-bottom: none;
+}}
+
+.notebook tab:hover {{
+    background-color: {tab_hover_bg};
+    color: {tab_hover_fg};
+}}
+
+.notebook tab:checked {{
+    background-color: {tab_active_bg};
+    color: {tab_active_fg};
+}}
+
+/* Tab close buttons */
+.tab-close-button {{
+    background-color: {button_bg};
+    color: {button_fg};
+    border: none;
+    border-radius: 2px;
+    padding: 2px 4px;
+}}
+
+.tab-close-button:hover {{
+    background-color: {button_bg};
+}}
+
+/* Window background */
+.window {{
+    background-color: {window_bg};
+}}
+"""
+
+_CSS_DEFAULTS = {
+    'menu_bar_bg': '#F5F5F5',
+    'menu_bar_fg': '#000000',
+    'tab_bar_bg': '#E8E8E8',
+    'menu_item_bg': '#FFFFFF',
+    'menu_item_fg': '#000000',
+    'menu_item_hover_bg': '#E0E0E0',
+    'menu_item_hover_fg': '#000000',
+    'tab_bg': '#D0D0D0',
+    'tab_fg': '#000000',
+    'tab_hover_bg': '#C0C0C0',
+    'tab_hover_fg': '#000000',
+    'tab_active_bg': '#FFFFFF',
+    'tab_active_fg': '#000000',
+    'button_bg': '#E0E0E0',
+    'button_fg': '#000000',
+    'window_bg': '#FFFFFF'
+}
+
 class TerminalWindow(Gtk.Window):
+    # Default screen, looked up on first theme application
+    _screen = None
+    # The screen is shared by every window, so the compiled UI theme providers
+    # (keyed by theme name and colors) and the one installed are per process
+    _css_cache = {}
+    _active_css_provider = None
+
     def __init__(self):
         super().__init__(title="NewTerm")
         self.set_default_size(800, 600)
 
-        # Initialize managers
-        self.config = Config()
-        self.keybinding_manager = KeyBindingManager()
-        self.plugin_manager = PluginManager()
+        # Initialize managers (shared by every window in the process)
+        self.config = get_config()
+        self.keybinding_manager = get_keybinding_manager()
+        self.plugin_manager = get_plugin_manager()
         self.session_manager = SessionManager(self.config)
 
-        # Load keybindings from config
-        self.keybinding_manager.load_from_config(self.config.config)
+        # Set once deferred plugins have loaded and can see terminal_created
+        self._plugins_ready = False
 
-        # Load plugins
-        self.plugin_manager.discover_plugins()
-        plugins = self.plugin_manager.discover_plugins()
-        for plugin_config in plugins:
-            self.plugin_manager.load_plugin(plugin_config)
+        # Theme settings last applied, to tell which kind a save changed
+        self._theme_state = self._theme_snapshot(self.config.config)
+
+        # Preferences dialog, created on first use and then reused
+        self._preferences = None
+
+        # Session tabs still to be restored, their active index, and the
+        # idle source restoring them
+        self._restore_pending = None
+        self._restore_active_index = 0
+        self._restore_source = None
 
         # Create tab manager
         self.tab_manager = TabManager(self.config)
@@ -76,110 +240,59 @@ class TerminalWindow(Gtk.Window):
         # Connect plugin events
         self.connect_plugin_events()
 
+        # Load deferred plugins a couple at a time once the window is up
+        self._plugin_load_source = GLib.idle_add(self._load_pending_plugins_chunk)
+
     def create_menu_bar(self):
         """Create the menu bar with all menu items."""
         self.menubar = Gtk.MenuBar()
 
-        # File menu
-        file_menu = Gtk.Menu()
-        file_item = Gtk.MenuItem(label="File")
-        file_item.set_submenu(file_menu)
-
-        new_tab_item = Gtk.MenuItem(label="New Tab")
-        new_tab_item.connect("activate", self.on_new_tab)
-        file_menu.append(new_tab_item)
-
-        new_window_item = Gtk.MenuItem(label="New Window")
-        new_window_item.connect("activate", self.on_new_window)
-        file_menu.append(new_window_item)
-
-        file_menu.append(Gtk.SeparatorMenuItem())
-
-        close_tab_item = Gtk.MenuItem(label="Close Tab")
-        close_tab_item.connect("activate", self.on_close_tab)
-        file_menu.append(close_tab_item)
-
-        file_menu.append(Gtk.SeparatorMenuItem())
-
-        quit_item = Gtk.MenuItem(label="Quit")
-        quit_item.connect("activate", self.on_quit)
-        file_menu.append(quit_item)
-
-        # Edit menu
-        edit_menu = Gtk.Menu()
-        edit_item = Gtk.MenuItem(label="Edit")
-        edit_item.set_submenu(edit_menu)
-
-        copy_item = Gtk.MenuItem(label="Copy")
-        copy_item.connect("activate", self.on_copy)
-        edit_menu.append(copy_item)
-
-        paste_item = Gtk.MenuItem(label="Paste")
-        paste_item.connect("activate", self.on_paste)
-        edit_menu.append(paste_item)
-
-        edit_menu.append(Gtk.SeparatorMenuItem())
-
-        select_all_item = Gtk.MenuItem(label="Select All")
-        select_all_item.connect("activate", self.on_select_all)
-        edit_menu.append(select_all_item)
-
-        # View menu
-        view_menu = Gtk.Menu()
-        view_item = Gtk.MenuItem(label="View")
-        view_item.set_submenu(view_menu)
-
-        fullscreen_item = Gtk.MenuItem(label="Toggle Fullscreen")
-        fullscreen_item.connect("activate", self.on_toggle_fullscreen)
-        view_menu.append(fullscreen_item)
-
-        # Tools menu
-        tools_menu = Gtk.Menu()
-        tools_item = Gtk.MenuItem(label="Tools")
-        tools_item.set_submenu(tools_menu)
-
-        command_palette_item = Gtk.MenuItem(label="Command Palette")
-        command_palette_item.connect("activate", self.on_command_palette)
-        tools_menu.append(command_palette_item)
-
-        # Preferences menu
-        pref_menu = Gtk.Menu()
-        pref_item = Gtk.MenuItem(label="Preferences")
-        pref_item.set_submenu(pref_menu)
-
-        preferences_item = Gtk.MenuItem(label="Settings")
-        preferences_item.connect("activate", self.on_preferences)
-        pref_menu.append(preferences_item)
-
-        # Add plugin menu items
+        for label, entries in _MENU_SPEC:
+            menu = Gtk.Menu()
+            menu_item = Gtk.MenuItem(label=label)
+            menu_item.set_submenu(menu)
+            for entry in entries:
+                if entry is None:
+                    menu.append(Gtk.SeparatorMenuItem())
+                    continue
+                item_label, handler = entry
+                item = Gtk.MenuItem(label=item_label)
+                item.connect("activate", getattr(self, handler))
+                menu.append(item)
+            self.menubar.append(menu_item)
+            if label == _PLUGIN_MENU:
+                pref_menu = menu
+
+        # Add plugin menu items; more are appended as deferred plugins load
+        self._plugin_menu = pref_menu
+        self._menu_plugins = set()
         self._add_plugin_menu_items(pref_menu)
 
-        # Help menu
-        help_menu = Gtk.Menu()
-        help_item = Gtk.MenuItem(label="Help")
-        help_item.set_submenu(help_menu)
-
-        about_item = Gtk.MenuItem(label="About")
-        about_item.connect("activate", self.on_about)
-        help_menu.append(about_item)
-
-        # Add all menus
-        self.menubar.append(file_item)
-        self.menubar.append(edit_item)
-        self.menubar.append(view_item)
-        self.menubar.append(tools_item)
-        self.menubar.append(pref_item)
-        self.menubar.append(help_item)
-
     def _add_plugin_menu_items(self, parent_menu):
-        """Add menu items from plugins."""
-        for plugin in self.plugin_manager.get_enabled_plugins().values():
-            if hasattr(plugin, 'create_menu_items'):
-                menu_items = plugin.create_menu_items()
-                for item in menu_items:
-                    menu_item = Gtk.MenuItem(label=item.get('label', 'Plugin Item'))
-                    menu_item.connect("activate", item.get('callback', lambda: None))
-                    parent_menu.append(menu_item)
+        """Add menu items from plugins that have not contributed any yet."""
+        for plugin in self.plugin_manager.get_ui_plugins():
+            if plugin in self._menu_plugins:
+                continue
+            self._menu_plugins.add(plugin)
+            for item in plugin.create_menu_items():
+                menu_item = Gtk.MenuItem(label=item.get('label', 'Plugin Item'))
+                menu_item.connect("activate", item.get('callback') or _NOOP)
+                menu_item.show()
+                parent_menu.append(menu_item)
+
+    def _load_pending_plugins_chunk(self):
+        """Load a few deferred plugins per idle tick."""
+        self.plugin_manager.load_pending_plugins(2)
+        self._add_plugin_menu_items(self._plugin_menu)
+        if self.plugin_manager.has_pending_plugins():
+            return True
+
+        # All plugins are in; announce the terminals that already exist
+        self._plugin_load_source = None
+        self._plugins_ready = True
+        for tab in self.tab_manager.get_tabs():
+            self.plugin_manager.emit_event("terminal_created", terminal=tab.get_terminal())
+        return False
 
     def create_main_ui(self):
         """Create the main user interface."""
@@ -201,9 +314,6 @@ class TerminalWindow(Gtk.Window):
 
         self.add(main_vbox)
 
-        # Show all widgets
-        self.show_all()
-
     def apply_ui_theme(self):
         """Apply the current UI theme to menus and window."""
         ui_theme_name = self.config.get('ui_theme', 'Default')
@@ -213,130 +323,122 @@ class TerminalWindow(Gtk.Window):
         if not theme_colors:
             return
 
-        # Apply CSS styling for UI elements
-        css = f"""
-        /* Menu bar styling */
-        .menubar {{
-            background-color: {theme_colors.get('menu_bar_bg', '#F5F5F5')};
-            color: {theme_colors.get('menu_bar_fg', '#000000')};
-            border-bottom: 1px solid {theme_colors.get('tab_bar_bg', '#E8E8E8')};
-        }}
-
-        /* Menu items */
-        .menubar menuitem {{
-            background-color: {theme_colors.get('menu_item_bg', '#FFFFFF')};
-            color: {theme_colors.get('menu_item_fg', '#000000')};
-        }}
-
-        .menubar menuitem:hover {{
-            background-color: {theme_colors.get('menu_item_hover_bg', '#E0E0E0')};
-            color: {theme_colors.get('menu_item_hover_fg', '#000000')};
-        }}
-
-        /* Notebook tabs */
-        .notebook tab {{
-            background-color: {theme_colors.get('tab_bg', '#D0D0D0')};
-            color: {theme_colors.get('tab_fg', '#000000')};
-            padding: 4px 8px;
-            border: 1px solid {theme_colors.get('tab_bar_bg', '#E8E8E8')};
-            border-bottom: none;
-        }}
-
-        .notebook tab:hover {{
-            background-color: {theme_colors.get('tab_hover_bg', '#C0C0C0')};
-            color: {theme_colors.get('tab_hover_fg', '#000000')};
-        }}
-
-        .notebook tab:checked {{
-            background-color: {theme_colors.get('tab_active_bg', '#FFFFFF')};
-            color: {theme_colors.get('tab_active_fg', '#000000')};
-        }}
-
-        /* Tab close buttons */
-        .tab-close-button {{
-            background-color: {theme_colors.get('button_bg', '#E0E0E0')};
-            color: {theme_colors.get('button_fg', '#000000')};
-            border: none;
-            border-radius: 2px;
-            padding: 2px 4px;
-        }}
-
-        .tab-close-button:hover {{
-            background-color: {theme_colors.get('button_bg', '#E0E0E0')};
-        }}
-
-        /* Window background */
-        .window {{
-            background-color: {theme_colors.get('window_bg', '#FFFFFF')};
-        }}
-        """
-
-        # Apply CSS to the window
-        css_provider = Gtk.CssProvider()
-        css_provider.load_from_data(css.encode())
+        # The notebook carries its own tab CSS, which the screen CSS can't override
+        self.tab_manager.apply_ui_theme()
 
-        # Get the screen and apply to all widgets
-        screen = Gdk.Screen.get_default()
-        style_context = Gtk.StyleContext()
-        style_context.add_provider_for_screen(
+        key = (ui_theme_name, tuple(sorted(theme_colors.items())))
+        css_provider = TerminalWindow._css_cache.get(key)
+        if css_provider is None:
+            css_provider = self._build_css_provider(theme_colors)
+            TerminalWindow._css_cache[key] = css_provider
+
+        if css_provider is TerminalWindow._active_css_provider:
+            return
+
+        # Swap the screen-level provider; it styles the menubar and notebook too
+        screen = TerminalWindow._screen
+        if screen is None:
+            screen = TerminalWindow._screen = Gdk.Screen.get_default()
+        if TerminalWindow._active_css_provider is not None:
+            Gtk.StyleContext.remove_provider_for_screen(screen, TerminalWindow._active_css_provider)
+        Gtk.StyleContext.add_provider_for_screen(
             screen,
             css_provider,
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
         )
+        TerminalWindow._active_css_provider = css_provider
 
-        # Apply to specific widgets
-        if hasattr(self, 'menubar') and self.menubar:
-            self.menubar.get_style_context().add_provider(
-                css_provider,
-                Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-            )
+    def _theme_snapshot(self, config):
+        """Get (terminal theme, UI theme) settings from a config dict."""
+        return copy.deepcopy((
+            (config.get('theme'), config.get('font')),
+            (config.get('ui_theme'), config.get('ui_themes'))
+        ))
 
-        if hasattr(self, 'notebook') and self.notebook:
-            self.notebook.get_style_context().add_provider(
-                css_provider,
-                Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-            )
+    def _build_css_provider(self, theme_colors):
+        """Compile the UI theme CSS for a set of colors."""
+        # Apply CSS styling for UI elements
+        css = _CSS_TEMPLATE.format_map(ChainMap(theme_colors, _CSS_DEFAULTS))
+
+        css_provider = Gtk.CssProvider()
+        css_provider.load_from_data(css.encode())
+        return css_provider
 
     def restore_or_create_initial_tab(self):
         """Restore previous session or create initial tab."""
         if self.config.get('restore_session', True):
             session_data = self.session_manager.restore_session()
             if session_data and session_data.get('tabs'):
-                # Restore tabs from session
-                for i, tab_data in enumerate(session_data.get('tabs', [])):
-                    title = tab_data.get('title', 'Terminal')
-                    directory = tab_data.get('working_directory', None)
-                    tab = self.tab_manager.new_tab(title, directory)
-
-                # Set active tab
-                active_index = session_data.get('active_tab', 0)
-                if 0 <= active_index < len(self.tab_manager.get_tabs()):
-                    self.tab_manager.set_active_tab(self.tab_manager.get_tabs()[active_index])
+                # Restore the first tab now and stream the rest in from idle
+                # callbacks, keeping session order so page numbers line up
+                pending = iter(session_data['tabs'])
+                self._restore_tab(next(pending))
+                self._restore_pending = pending
+                self._restore_active_index = session_data.get('active_tab', 0)
+                self._restore_source = GLib.idle_add(self._restore_next_tab)
             else:
                 # Create initial tab
                 tab = self.tab_manager.new_tab()
-                print(f"Created initial tab: {tab}")
+                logger.debug("Created initial tab: %s", tab)
         else:
             # Create initial tab
             tab = self.tab_manager.new_tab()
-            print(f"Created initial tab: {tab}")
+            logger.debug("Created initial tab: %s", tab)
 
         # Ensure we have at least one tab and it's visible
-        if len(self.tab_manager.get_tabs()) == 0:
-            print("No tabs found, creating emergency tab")
+        if not self.tab_manager.tabs:
+            logger.debug("No tabs found, creating emergency tab")
             tab = self.tab_manager.new_tab()
-            print(f"Emergency tab created: {tab}")
+            logger.debug("Emergency tab created: %s", tab)
 
         # Make sure the notebook is visible
         if self.notebook:
             self.notebook.show_all()
 
+    def _restore_tab(self, tab_data):
+        """Create a tab from saved session data."""
+        title = tab_data.get('title', 'Terminal')
+        directory = tab_data.get('working_directory', None)
+        return self.tab_manager.new_tab(title, directory)
+
+    def _restore_next_tab(self):
+        """Restore one more session tab per idle tick."""
+        tab_data = next(self._restore_pending, None)
+        if tab_data is not None:
+            tab = self._restore_tab(tab_data)
+            tab.get_terminal().show()
+            self._connect_tab_events(tab)
+            return True
+
+        # Everything is back; select the tab that was active at save time
+        self._restore_source = None
+        self._restore_pending = None
+        tabs = self.tab_manager.get_tabs()
+        if 0 <= self._restore_active_index < len(tabs):
+            self.tab_manager.set_active_tab(tabs[self._restore_active_index])
+        return False
+
+    def _take_unrestored_tabs(self):
+        """Stop restoring the session and return the tab data not restored yet."""
+        if self._restore_source is None:
+            return []
+        GLib.source_remove(self._restore_source)
+        self._restore_source = None
+        pending, self._restore_pending = self._restore_pending, None
+        return list(pending)
+
     def connect_plugin_events(self):
         """Connect plugin events to the plugin manager."""
-        # Terminal events
-        for tab in self.tab_manager.get_tabs():
-            self.plugin_manager.emit_event("terminal_created", terminal=tab.get_terminal())
-            tab.get_terminal().connect("child-exited", self.on_terminal_exited)
+        for tab in self.tab_manager.iter_tabs():
+            self._connect_tab_events(tab)
+
+    def _connect_tab_events(self, tab):
+        """Forward a tab's terminal events to plugins."""
+        terminal = tab.get_terminal()
+        terminal.connect("child-exited", self.on_terminal_exited)
+        # Until deferred plugins load, terminal_created is sent in one batch
+        if self._plugins_ready:
+            self.plugin_manager.emit_event("terminal_created", terminal=terminal)
 
     def on_terminal_exited(self, terminal, status):
         """Handle terminal process exit."""
@@ -349,8 +451,8 @@ class TerminalWindow(Gtk.Window):
 
     def on_new_window(self, widget):
         """Handle new window creation."""
-        # Create new instance
-        os.system(f"{sys.executable} {sys.argv[0]} &")
+        # Open another window in this process, sharing the main loop
+        _open_window()
 
     def on_close_tab(self, widget):
         """Handle tab closing."""
@@ -361,24 +463,41 @@ class TerminalWindow(Gtk.Window):
 
     def on_quit(self, widget):
         """Handle application quit."""
-        # Save session
+        # Quitting ends every window in this process, so save all their tabs,
+        # starting with this window's and keeping its active tab selected
+        windows = [self] + [win for win in _WINDOWS if win is not self]
         tabs_data = []
-        for tab in self.tab_manager.get_tabs():
-            tabs_data.append({
-                'title': tab.get_title(),
-                'working_directory': tab.working_directory
-            })
-
         active_tab_index = 0
         active_tab = self.tab_manager.get_active_tab()
-        if active_tab:
-            try:
-                active_tab_index = self.tab_manager.get_tabs().index(active_tab)
-            except ValueError:
-                pass
-
-        self.session_manager.save_session(tabs_data, active_tab_index)
-        Gtk.main_quit()
+        # Mid-restore, the session's own active tab hasn't been selected yet
+        restoring = self._restore_source is not None
+        for win in windows:
+            for tab in win.tab_manager.iter_tabs():
+                if tab is active_tab:
+                    active_tab_index = len(tabs_data)
+                tabs_data.append({
+                    'title': tab.get_title(),
+                    'working_directory': tab.working_directory
+                })
+            # Tabs not restored yet keep their place instead of being dropped
+            tabs_data.extend(win._take_unrestored_tabs())
+        if restoring:
+            active_tab_index = self._restore_active_index
+
+        # Last write before exit, so make sure it reaches the disk
+        self.session_manager.save_session(tabs_data, active_tab_index, durable=True)
+
+        # Quit once every window's shells are gone, rather than leaving them behind
+        remaining = len(windows)
+
+        def on_window_shut_down():
+            nonlocal remaining
+            remaining -= 1
+            if remaining == 0:
+                Gtk.main_quit()
+
+        for win in windows:
+            win.tab_manager.shutdown(on_window_shut_down)
 
     def on_copy(self, widget=None):
         """Handle copy action."""
@@ -412,31 +531,38 @@ class TerminalWindow(Gtk.Window):
 
     def on_preferences(self, widget=None):
         """Handle preferences dialog."""
-        dialog = PreferencesDialog(
-            self,
-            self.config,
-            self.keybinding_manager,
-            self.plugin_manager
-        )
+        # One dialog per window, hidden between uses
+        if self._preferences is None:
+            self._preferences = PreferencesDialog(
+                self,
+                self.config,
+                self.keybinding_manager,
+                self.plugin_manager
+            )
+            self._preferences.set_config_changed_callback(self._on_preferences_changed)
+        self._preferences.show()
+
+    def _on_preferences_changed(self, new_config):
+        """Handle configuration changes from the preferences dialog."""
+        terminal_theme, ui_theme = self._theme_snapshot(new_config)
 
-        def on_config_changed(new_config):
-            """Handle configuration changes."""
-            # Apply new config to all tabs
-            for tab in self.tab_manager.get_tabs():
-                tab.apply_theme()
+        # Repaint terminals only if their colors or font changed
+        if terminal_theme != self._theme_state[0]:
+            self.tab_manager.apply_theme()
 
-            # Apply UI theme changes
+        # Apply UI theme changes
+        if ui_theme != self._theme_state[1]:
             self.apply_ui_theme()
 
-            # Reload keybindings
-            self.keybinding_manager.load_from_config(new_config)
-            self.keybinding_manager.connect_to_window(self, None)
+        self._theme_state = (terminal_theme, ui_theme)
 
-            # Notify plugins
-            self.plugin_manager.emit_event("config_changed", config=new_config)
+        # Reload keybindings, touching only accelerators that changed
+        added, removed, changed = self.keybinding_manager.load_from_config(new_config)
+        if added or removed or changed:
+            self.keybinding_manager.apply_delta(self, added, removed, changed)
 
-        dialog.set_config_changed_callback(on_config_changed)
-        dialog.show()
+        # Notify plugins
+        self.plugin_manager.emit_event("config_changed", config=new_config)
 
     def on_about(self, widget=None):
         """Handle about dialog."""
@@ -450,6 +576,28 @@ class TerminalWindow(Gtk.Window):
         about_dialog.run()
         about_dialog.destroy()
 
+# Top-level windows still open; the main loop ends with the last one
+_WINDOWS = set()
+
+def _on_window_destroy(win):
+    """Forget a closed window and quit once none are left."""
+    # Stop restoring tabs into the destroyed notebook, and stop adding
+    # plugin menu items and terminals to it
+    win._take_unrestored_tabs()
+    if win._plugin_load_source is not None:
+        GLib.source_remove(win._plugin_load_source)
+        win._plugin_load_source = None
+    _WINDOWS.discard(win)
+    if not _WINDOWS:
+        Gtk.main_quit()
+
+def _open_window():
+    """Create and track a new terminal window."""
+    win = TerminalWindow()
+    _WINDOWS.add(win)
+    win.connect("destroy", _on_window_destroy)
+    return win
+
 def main():
     """Main application entry point."""
     # Set up signal handlers
@@ -460,12 +608,11 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
 
     # Ensure GPU acceleration if enabled
-    if Config().get('gpu_acceleration', True):
+    if get_config().get('gpu_acceleration', True):
         os.environ['GDK_GL'] = 'always'
 
     # Create and show main window
-    win = TerminalWindow()
-    win.connect("destroy", Gtk.main_quit)
+    _open_window()
     Gtk.main()
 
 if __name__ == "__main__":
@@ -23,16 +23,61 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional, Callable, TYPE_CHECKING
 import os
 
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
 if TYPE_CHECKING:
     from plugin_manager import PluginManager
 
+# on_* methods that are lifecycle callbacks rather than event handlers
+_LIFECYCLE_METHODS = frozenset({"on_load", "on_unload"})
+
 class PluginBase(ABC):
-    """Base class for all plugins."""
+    """Base class for all plugins.
+
+    Instance state lives in __slots__; subclasses that declare their own
+    __slots__ (an empty tuple if they add nothing) keep instances dict-free.
+    """
+
+    __slots__ = ('plugin_manager', 'config', 'enabled', '_plugin_path', '__weakref__')
+
+    # (event_type, method name) for every @hook method and overridden
+    # on_<event> handler, computed once per class
+    _hook_table: tuple = ()
+    # Module name -> plugin classes it defined, filled in at import time
+    _registry: Dict[str, List[type]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """Register a plugin class and record its hooks and overridden handlers."""
+        super().__init_subclass__(**kwargs)
+        if cls.__module__ != __name__:
+            PluginBase._registry.setdefault(cls.__module__, []).append(cls)
+
+        # The most derived definition of each name decides its hooks
+        method_hooks = {}
+        for klass in reversed(cls.__mro__):
+            for name, attr in vars(klass).items():
+                method_hooks[name] = getattr(attr, "_plugin_hooks", ())
+        table = [(event_type, name)
+                 for name, events in method_hooks.items()
+                 for event_type in events]
+
+        # Overridden on_<event> handlers not already registered through @hook
+        hooked = set(table)
+        for name in method_hooks:
+            if (name.startswith("on_") and name not in _LIFECYCLE_METHODS
+                    and getattr(getattr(cls, name), "__module__", __name__) != __name__
+                    and (name[3:], name) not in hooked):
+                table.append((name[3:], name))
+        cls._hook_table = tuple(table)
 
     def __init__(self, plugin_manager: 'PluginManager', config: Dict[str, Any]):
         self.plugin_manager = plugin_manager
         self.config = config
         self.enabled = True
+        self._plugin_path = config.get("path")
 
     @abstractmethod
     def get_name(self) -> str:
@@ -100,6 +145,8 @@ class PluginBase(ABC):
 class TerminalPlugin(PluginBase):
     """Plugin that extends terminal functionality."""
 
+    __slots__ = ()
+
     def on_terminal_output(self, terminal, text: str):
         """Called when terminal receives output."""
         pass
@@ -115,6 +162,8 @@ class TerminalPlugin(PluginBase):
 class UIPlugin(PluginBase):
     """Plugin that adds UI elements."""
 
+    __slots__ = ()
+
     def create_menu_items(self) -> List[Dict[str, Any]]:
         """Create menu items for this plugin."""
         return []
@@ -130,6 +179,8 @@ class UIPlugin(PluginBase):
 class ThemePlugin(PluginBase):
     """Plugin that provides themes."""
 
+    __slots__ = ()
+
     def get_themes(self) -> Dict[str, Dict[str, Any]]:
         """Get themes provided by this plugin."""
         return {}
@@ -137,6 +188,8 @@ class ThemePlugin(PluginBase):
 class KeyBindingPlugin(PluginBase):
     """Plugin that provides keybindings."""
 
+    __slots__ = ()
+
     def get_keybindings(self) -> Dict[str, Dict[str, Any]]:
         """Get keybindings provided by this plugin."""
         return {}
@@ -154,12 +207,12 @@ class PluginEvent:
     THEME_CHANGED = "theme_changed"
 
 # Plugin hook decorators
-def hook(event_type: str):
-    """Decorator to register a hook for a plugin event."""
+def hook(event_type: str, priority: Optional[int] = None):
+    """Decorator to register a hook for a plugin event; lower priorities run first."""
     def decorator(func):
-        if not hasattr(func, '_plugin_hooks'):
-            func._plugin_hooks = []
-        func._plugin_hooks.append(event_type)
+        func._plugin_hooks = frozenset((event_type, *getattr(func, '_plugin_hooks', ())))
+        if priority is not None or not hasattr(func, '_plugin_priority'):
+            func._plugin_priority = priority or 0
         return func
     return decorator
 
@@ -176,6 +229,11 @@ PLUGIN_CONFIG_SCHEMA = {
             "items": {"type": "string"}
         },
         "enabled": {"type": "boolean"},
+        "events": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "threaded_import": {"type": "boolean"},
         "config": {
             "type": "object",
             "additionalProperties": True
@@ -183,3 +241,36 @@ PLUGIN_CONFIG_SCHEMA = {
     },
     "required": ["name", "version"]
 }
+
+# Top-level JSON types of the schema's properties, for the fallback check
+_PLUGIN_FIELD_TYPES = {
+    "name": str,
+    "version": str,
+    "description": str,
+    "author": str,
+    "dependencies": list,
+    "enabled": bool,
+    "events": list,
+    "threaded_import": bool,
+    "config": dict
+}
+
+def _check_plugin_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Check a plugin manifest against PLUGIN_CONFIG_SCHEMA by hand."""
+    if not isinstance(config, dict):
+        raise ValueError("plugin config must be an object")
+    for key in PLUGIN_CONFIG_SCHEMA["required"]:
+        if key not in config:
+            raise ValueError(f"plugin config must contain '{key}'")
+    for key, expected in _PLUGIN_FIELD_TYPES.items():
+        if key in config and not isinstance(config[key], expected):
+            raise ValueError(f"plugin config '{key}' has the wrong type")
+    for key in ("dependencies", "events"):
+        if not all(isinstance(item, str) for item in config.get(key, [])):
+            raise ValueError(f"plugin config '{key}' must be a list of strings")
+    return config
+
+# Compiled once at import when fastjsonschema is installed; both raise ValueError
+validate_plugin_config: Callable[[Dict[str, Any]], Dict[str, Any]] = (
+    fastjsonschema.compile(PLUGIN_CONFIG_SCHEMA) if fastjsonschema else _check_plugin_config
+)
@@ -19,15 +19,47 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 This module handles loading, managing, and executing plugins.
 """
 
+import copy
 import os
 import sys
+import importlib.machinery
 import importlib.util
 import json
 import hashlib
-from typing import Dict, Any, List, Optional, Type, Callable
+import mmap
+import shutil
+from typing import Dict, Any, List, Optional, Tuple, Type, Callable
 from pathlib import Path
 import logging
-from plugin_api import PluginBase, PluginEvent, PLUGIN_CONFIG_SCHEMA
+import logging.handlers
+import queue
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from plugin_api import PluginBase, PluginEvent, PLUGIN_CONFIG_SCHEMA, validate_plugin_config
+
+# Parses JSON straight from bytes; orjson when available
+_loads = orjson.loads if orjson is not None else json.loads
+
+# orjson parses files above this size straight from a memory map
+_MMAP_THRESHOLD = 64 * 1024
+
+def _read_json(path: str) -> Any:
+    """Read and parse a JSON file."""
+    with open(path, 'rb') as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return orjson.loads(memoryview(mapped))
+        return _loads(f.read())
+
+def _hook_priority(handler: Callable) -> int:
+    """Get a hook's priority as set by @hook (0 when unset)."""
+    return getattr(handler, '_plugin_priority', 0)
 
 class PluginLoadError(Exception):
     """Exception raised when a plugin fails to load."""
@@ -42,7 +74,29 @@ class PluginManager:
         self.enabled_plugins: Dict[str, PluginBase] = {}
         self.disabled_plugins: Dict[str, PluginBase] = {}
         self.plugin_configs: Dict[str, Dict[str, Any]] = {}
-        self.event_hooks: Dict[str, List[Callable]] = {}
+        # Published hook snapshots read by emit_event; rebuilt from the
+        # mutable lists whenever hooks are added or removed
+        self.event_hooks: Dict[str, Tuple[Callable, ...]] = {}
+        self._event_hooks_mutable: Dict[str, List[Callable]] = {}
+        # Bumped whenever any snapshot changes
+        self._hook_cache_version = 0
+        # plugin id -> (event type, handler) pairs it registered
+        self._plugin_hook_index: Dict[str, List[Tuple[str, Callable]]] = {}
+        # Discovered plugins whose modules have not been imported yet
+        self._pending_plugins: List[Dict[str, Any]] = []
+        # Deferred plugins whose plugin.json declares its "events"; each is
+        # imported only when one of those events is first emitted
+        self._pending_by_event: Dict[str, List[Dict[str, Any]]] = {}
+        self._pending_by_name: Dict[str, Dict[str, Any]] = {}
+        # plugin path -> (plugin.json mtime_ns, parsed manifest); persisted
+        # to .plugin_cache.json and loaded on first discovery
+        self._discovery_cache: Optional[Dict[str, Any]] = None
+        # Enabled plugins by name, for dependency checks
+        self._plugins_by_name: Dict[str, PluginBase] = {}
+        # Enabled plugins that contribute menu items, in load order
+        self._ui_plugins: List[PluginBase] = []
+        # Theme names offered by enabled plugins; None until next requested
+        self._theme_names: Optional[Tuple[str, ...]] = None
         self.logger = logging.getLogger("newterm.plugins")
 
         # Create plugin directory if it doesn't exist
@@ -57,39 +111,76 @@ class PluginManager:
         handler = logging.FileHandler(log_file)
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+
+        # Records are queued and written by a background thread, keeping
+        # file I/O off the event dispatch path
+        self._log_queue = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(self._log_queue))
+        self._log_listener = logging.handlers.QueueListener(self._log_queue, handler)
+        self._log_listener.start()
+        atexit.register(self.stop_logging)
         self.logger.setLevel(logging.INFO)
 
+    def stop_logging(self):
+        """Flush queued log records and stop the writer thread."""
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            self._log_listener = None
+
     def discover_plugins(self) -> List[Dict[str, Any]]:
         """Discover available plugins in the plugin directory."""
         plugins = []
 
-        if not os.path.exists(self.plugin_dir):
+        try:
+            entries = os.scandir(self.plugin_dir)
+        except FileNotFoundError:
             return plugins
 
-        for item in os.listdir(self.plugin_dir):
-            plugin_path = os.path.join(self.plugin_dir, item)
-
-            if os.path.isdir(plugin_path):
-                # Check for plugin.json or __init__.py
-                plugin_config_path = os.path.join(plugin_path, "plugin.json")
-                init_path = os.path.join(plugin_path, "__init__.py")
-
-                if os.path.exists(plugin_config_path):
-                    try:
-                        with open(plugin_config_path, 'r') as f:
-                            config = json.load(f)
+        cache = self._get_discovery_cache()
+        dirty = False
+        seen = set()
 
-                        config['path'] = plugin_path
-                        config['id'] = self._generate_plugin_id(plugin_path)
-                        plugins.append(config)
-                    except Exception as e:
-                        self.logger.error(f"Error loading plugin config {plugin_config_path}: {e}")
+        sep = os.sep
+        with entries:
+            for entry in entries:
+                # d_type from scandir answers this without a stat
+                if not entry.is_dir():
+                    continue
 
-                elif os.path.exists(init_path):
+                # entry.path is already joined, so plain concatenation is enough
+                plugin_path = entry.path
+                # Check for plugin.json or __init__.py
+                plugin_config_path = plugin_path + sep + "plugin.json"
+                try:
+                    mtime_ns = os.stat(plugin_config_path).st_mtime_ns
+                except FileNotFoundError:
+                    mtime_ns = None
+
+                if mtime_ns is not None:
+                    seen.add(plugin_path)
+                    cached = cache.get(plugin_path)
+                    if cached is not None and cached[0] == mtime_ns:
+                        config = cached[1]
+                    else:
+                        try:
+                            config = _read_json(plugin_config_path)
+                            validate_plugin_config(config)
+                        except (OSError, ValueError) as e:
+                            self.logger.error("Error loading plugin config %s: %s", plugin_config_path, e)
+                            continue
+                        cache[plugin_path] = (mtime_ns, config)
+                        dirty = True
+
+                    # Hand out a copy so plugins can't alter the cached manifest
+                    config = copy.deepcopy(config)
+                    config['path'] = plugin_path
+                    config['id'] = self._generate_plugin_id(plugin_path)
+                    plugins.append(config)
+
+                elif os.path.exists(plugin_path + sep + "__init__.py"):
                     # Legacy plugin support
                     plugins.append({
-                        'name': item,
+                        'name': entry.name,
                         'version': '1.0.0',
                         'description': 'Legacy plugin',
                         'path': plugin_path,
@@ -97,14 +188,57 @@ class PluginManager:
                         'legacy': True
                     })
 
+        # Forget plugins that have been removed
+        for plugin_path in set(cache) - seen:
+            del cache[plugin_path]
+            dirty = True
+
+        if dirty:
+            self._save_discovery_cache()
+
         return plugins
 
+    def _discovery_cache_path(self) -> str:
+        """Get the path of the persisted discovery cache."""
+        return os.path.join(self.config_dir, ".plugin_cache.json")
+
+    def _get_discovery_cache(self) -> Dict[str, Any]:
+        """Get the manifest cache, reading it from disk on first use."""
+        if self._discovery_cache is None:
+            self._discovery_cache = {}
+            try:
+                stored = _read_json(self._discovery_cache_path())
+                for plugin_path, (mtime_ns, config) in stored.items():
+                    self._discovery_cache[plugin_path] = (mtime_ns, config)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                self.logger.warning("Ignoring unreadable plugin cache: %s", e)
+        return self._discovery_cache
+
+    def _save_discovery_cache(self) -> None:
+        """Persist the manifest cache so cold starts can skip unchanged plugins."""
+        try:
+            if orjson is not None:
+                data = orjson.dumps(self._discovery_cache)
+            else:
+                data = json.dumps(self._discovery_cache).encode()
+            with open(self._discovery_cache_path(), 'wb') as f:
+                f.write(data)
+        except OSError as e:
+            self.logger.warning("Could not save plugin cache: %s", e)
+
     def _generate_plugin_id(self, plugin_path: str) -> str:
         """Generate a unique ID for a plugin."""
+        return hashlib.blake2b(plugin_path.encode(), digest_size=4).hexdigest()
+
+    def _legacy_plugin_id(self, plugin_path: str) -> str:
+        """Get the MD5-based ID older versions used for plugin config files."""
         return hashlib.md5(plugin_path.encode()).hexdigest()[:8]
 
-    def load_plugin(self, plugin_config: Dict[str, Any]) -> Optional[PluginBase]:
-        """Load a single plugin."""
+    def load_plugin(self, plugin_config: Dict[str, Any],
+                    plugin_class: Optional[Type[PluginBase]] = None) -> Optional[PluginBase]:
+        """Load a single plugin, optionally from an already imported class."""
         plugin_path = plugin_config['path']
         plugin_id = plugin_config['id']
 
@@ -114,10 +248,8 @@ class PluginManager:
                 return self.enabled_plugins.get(plugin_id) or self.disabled_plugins.get(plugin_id)
 
             # Load plugin module
-            if plugin_config.get('legacy', False):
-                plugin_class = self._load_legacy_plugin(plugin_path, plugin_config)
-            else:
-                plugin_class = self._load_modern_plugin(plugin_path, plugin_config)
+            if plugin_class is None:
+                plugin_class = self._load_plugin_class(plugin_config)
 
             if not plugin_class:
                 raise PluginLoadError("Could not load plugin class")
@@ -127,7 +259,7 @@ class PluginManager:
 
             # Validate dependencies
             if not self._check_dependencies(plugin):
-                self.logger.warning(f"Plugin {plugin_config['name']} has unmet dependencies")
+                self.logger.warning("Plugin %s has unmet dependencies", plugin_config['name'])
                 self.disabled_plugins[plugin_id] = plugin
                 return None
 
@@ -138,48 +270,207 @@ class PluginManager:
             try:
                 plugin.on_load()
             except Exception as e:
-                self.logger.error(f"Error in plugin on_load: {e}")
+                self.logger.error("Error in plugin on_load: %s", e)
 
             # Register event hooks
-            self._register_event_hooks(plugin)
+            self._register_event_hooks(plugin, plugin_id)
 
             # Store plugin
             if plugin.is_enabled():
                 self.enabled_plugins[plugin_id] = plugin
-                self.logger.info(f"Loaded plugin: {plugin.get_name()} v{plugin.get_version()}")
+                self._index_enabled(plugin)
+                self.logger.info("Loaded plugin: %s v%s", plugin.get_name(), plugin.get_version())
             else:
                 self.disabled_plugins[plugin_id] = plugin
 
             return plugin
 
         except Exception as e:
-            self.logger.error(f"Error loading plugin {plugin_config.get('name', 'unknown')}: {e}")
+            self.logger.error("Error loading plugin %s: %s", plugin_config.get('name', 'unknown'), e)
             return None
 
+    def defer_plugins(self, plugin_configs: List[Dict[str, Any]]) -> None:
+        """Queue discovered plugins to be loaded later, in order."""
+        for plugin_config in plugin_configs:
+            events = plugin_config.get('events')
+            if events and not plugin_config.get('legacy', False):
+                self._pending_by_name[plugin_config['name']] = plugin_config
+                for event_type in events:
+                    self._pending_by_event.setdefault(event_type, []).append(plugin_config)
+            else:
+                # Hooks are unknown until import, so these load eagerly
+                self._pending_plugins.append(plugin_config)
+
+    def has_pending_plugins(self) -> bool:
+        """Check if any deferred plugins are still waiting to load."""
+        return bool(self._pending_plugins)
+
+    def load_pending_plugins(self, limit: Optional[int] = None) -> List[PluginBase]:
+        """Load up to `limit` deferred plugins (all of them when None)."""
+        count = len(self._pending_plugins) if limit is None else limit
+        batch = self._pending_plugins[:count]
+        del self._pending_plugins[:count]
+
+        return self._load_deferred(batch)
+
+    def _load_deferred(self, batch: List[Dict[str, Any]]) -> List[PluginBase]:
+        """Load deferred plugins and their deferred dependencies, each only once."""
+        batch = self._with_deferred_dependencies(batch)
+        # Tried once whether or not it loads, so no other event retries it
+        self._forget_pending(batch)
+        return self.load_all(batch)
+
+    def _forget_pending(self, plugin_configs: List[Dict[str, Any]]) -> None:
+        """Drop plugins from every event-deferred index."""
+        for plugin_config in plugin_configs:
+            if self._pending_by_name.get(plugin_config['name']) is plugin_config:
+                del self._pending_by_name[plugin_config['name']]
+            for event_type in plugin_config.get('events') or ():
+                queued = self._pending_by_event.get(event_type)
+                if queued is None:
+                    continue
+                queued = [config for config in queued if config is not plugin_config]
+                if queued:
+                    self._pending_by_event[event_type] = queued
+                else:
+                    del self._pending_by_event[event_type]
+
+    def _iter_pending(self):
+        """Iterate over the plugins that are still waiting to load."""
+        yield from self._pending_plugins
+        yield from self._pending_by_name.values()
+
+    def _with_deferred_dependencies(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Put event-deferred dependencies ahead of the plugins needing them."""
+        ordered = []
+        seen = set()
+
+        def visit(plugin_config):
+            if plugin_config['id'] in seen:
+                return
+            seen.add(plugin_config['id'])
+            for dep in plugin_config.get('dependencies', []):
+                dep_config = self._pending_by_name.get(dep)
+                if dep_config is not None:
+                    visit(dep_config)
+            ordered.append(plugin_config)
+
+        for plugin_config in batch:
+            visit(plugin_config)
+        return [c for c in ordered if self.get_plugin(c['id']) is None]
+
+    def load_all(self, plugin_configs: List[Dict[str, Any]]) -> List[PluginBase]:
+        """Load several plugins, importing opted-in modules concurrently."""
+        # Module-level code may create GTK objects, so only plugins whose
+        # manifest sets "threaded_import" are imported on worker threads.
+        # Instantiation, on_load and registration stay on this thread in the
+        # given order, since they may touch GTK and dependencies must be
+        # loaded first.
+        to_import = [
+            config for config in plugin_configs
+            if config.get('threaded_import', False) and self.get_plugin(config['id']) is None
+        ]
+        # Largest modules first to keep the slowest import off the tail
+        to_import.sort(key=self._plugin_main_size, reverse=True)
+
+        classes = {}
+        if len(to_import) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+                futures = [(config['id'], pool.submit(self._load_plugin_class, config))
+                           for config in to_import]
+            classes = {plugin_id: future.result() for plugin_id, future in futures}
+
+        loaded = []
+        for plugin_config in plugin_configs:
+            plugin_id = plugin_config['id']
+            if plugin_id in classes and classes[plugin_id] is None:
+                # The import already failed and was logged; don't retry it
+                self.logger.error("Error loading plugin %s: Could not load plugin class",
+                                  plugin_config.get('name', 'unknown'))
+                continue
+            plugin = self.load_plugin(plugin_config, classes.get(plugin_id))
+            if plugin is not None:
+                loaded.append(plugin)
+        return loaded
+
+    def _plugin_main_size(self, plugin_config: Dict[str, Any]) -> int:
+        """Get the size of a plugin's main file, or 0 if it can't be read."""
+        main_path = os.path.join(plugin_config['path'], plugin_config.get('main', 'plugin.py'))
+        try:
+            return os.path.getsize(main_path)
+        except OSError:
+            return 0
+
+    def _load_plugin_class(self, plugin_config: Dict[str, Any]) -> Optional[Type[PluginBase]]:
+        """Import a plugin's module and return its plugin class."""
+        if plugin_config.get('legacy', False):
+            return self._load_legacy_plugin(plugin_config['path'], plugin_config)
+        return self._load_modern_plugin(plugin_config['path'], plugin_config)
+
+    def _index_enabled(self, plugin: PluginBase) -> None:
+        """Add a newly enabled plugin to the name and menu-item indexes."""
+        self._theme_names = None
+        self._plugins_by_name.setdefault(plugin.get_name(), plugin)
+        if callable(getattr(plugin, 'create_menu_items', None)) and plugin not in self._ui_plugins:
+            self._ui_plugins.append(plugin)
+
+    def _unindex_enabled(self, plugin: PluginBase) -> None:
+        """Drop a plugin that is no longer enabled from the indexes."""
+        self._theme_names = None
+        name = plugin.get_name()
+        if self._plugins_by_name.get(name) is plugin:
+            del self._plugins_by_name[name]
+            # Another enabled plugin may share the name
+            for other in self.enabled_plugins.values():
+                if other is not plugin and other.get_name() == name:
+                    self._plugins_by_name[name] = other
+                    break
+        if plugin in self._ui_plugins:
+            self._ui_plugins.remove(plugin)
+
     def _load_legacy_plugin(self, plugin_path: str, config: Dict[str, Any]) -> Optional[Type[PluginBase]]:
         """Load a legacy plugin (Python module)."""
         try:
-            import importlib
             plugin_name = config['name'].replace('-', '_')
-            sys.path.insert(0, plugin_path)
+            # Resolve the module against the plugin directory only, so
+            # sys.path is never touched and imports can run concurrently
+            spec = importlib.machinery.PathFinder.find_spec(plugin_name, [plugin_path])
+            if spec is None or spec.loader is None:
+                raise PluginLoadError(f"Module not found: {plugin_name}")
 
+            module = importlib.util.module_from_spec(spec)
+            # Registered like a regular import so relative imports resolve
+            sys.modules[spec.name] = module
             try:
-                module = importlib.import_module(plugin_name)
-                # Look for plugin class
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
-                    if (isinstance(attr, type) and
-                        issubclass(attr, PluginBase) and
-                        attr != PluginBase):
-                        return attr
-            finally:
-                sys.path.remove(plugin_path)
+                spec.loader.exec_module(module)
+            except BaseException:
+                sys.modules.pop(spec.name, None)
+                raise
+
+            return self._find_plugin_class(module)
 
         except Exception as e:
-            self.logger.error(f"Error loading legacy plugin: {e}")
+            self.logger.error("Error loading legacy plugin: %s", e)
 
         return None
 
+    def _find_plugin_class(self, module: Any) -> Optional[Type[PluginBase]]:
+        """Find the first PluginBase subclass defined by a module."""
+        # Classes register themselves by module as they are defined; popping
+        # the entry keeps a reloaded module from seeing its old classes
+        classes = PluginBase._registry.pop(module.__name__, None)
+        if classes:
+            return classes[0]
+
+        # Fall back to scanning for a class the module imported from elsewhere
+        for attr_name in dir(module):
+            attr = getattr(module, attr_name)
+            if (isinstance(attr, type) and
+                issubclass(attr, PluginBase) and
+                attr.__module__ != PluginBase.__module__):
+                return attr
+        return None
+
     def _load_modern_plugin(self, plugin_path: str, config: Dict[str, Any]) -> Optional[Type[PluginBase]]:
         """Load a modern plugin with plugin.json."""
         try:
@@ -198,60 +489,68 @@ class PluginManager:
             module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(module)
 
-            # Find plugin class
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (isinstance(attr, type) and
-                    issubclass(attr, PluginBase) and
-                    attr != PluginBase):
-                    return attr
+            return self._find_plugin_class(module)
 
         except Exception as e:
-            self.logger.error(f"Error loading modern plugin: {e}")
+            self.logger.error("Error loading modern plugin: %s", e)
 
         return None
 
     def _check_dependencies(self, plugin: PluginBase) -> bool:
         """Check if plugin dependencies are satisfied."""
-        dependencies = plugin.get_dependencies()
-
-        for dep in dependencies:
-            # Check if dependency is loaded
-            dep_found = False
-            for loaded_plugin in self.enabled_plugins.values():
-                if loaded_plugin.get_name() == dep:
-                    dep_found = True
-                    break
-
-            if not dep_found:
-                return False
-
-        return True
+        loaded = self._plugins_by_name
+        return all(dep in loaded for dep in plugin.get_dependencies())
 
     def _load_plugin_config(self, plugin_id: str, plugin_config: Dict[str, Any]) -> Dict[str, Any]:
         """Load plugin-specific configuration."""
         config_file = os.path.join(self.config_dir, f"plugin_{plugin_id}.json")
 
-        if os.path.exists(config_file):
-            try:
-                with open(config_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                self.logger.error(f"Error loading plugin config: {e}")
+        # Carry over a config file saved under the old MD5-based ID
+        if not os.path.exists(config_file) and 'path' in plugin_config:
+            legacy_file = os.path.join(
+                self.config_dir, f"plugin_{self._legacy_plugin_id(plugin_config['path'])}.json")
+            if os.path.exists(legacy_file):
+                try:
+                    os.replace(legacy_file, config_file)
+                except OSError as e:
+                    self.logger.warning("Could not migrate plugin config %s: %s", legacy_file, e)
+
+        try:
+            return _read_json(config_file)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.error("Error loading plugin config: %s", e)
 
         # Return default config
         return plugin_config.get('config', {})
 
-    def _register_event_hooks(self, plugin: PluginBase):
+    def _register_event_hooks(self, plugin: PluginBase, plugin_id: str):
         """Register event hooks for a plugin."""
-        # Get all methods with _plugin_hooks attribute
-        for attr_name in dir(plugin):
-            attr = getattr(plugin, attr_name)
-            if hasattr(attr, '_plugin_hooks'):
-                for event_type in attr._plugin_hooks:
-                    if event_type not in self.event_hooks:
-                        self.event_hooks[event_type] = []
-                    self.event_hooks[event_type].append(attr)
+        registered = self._plugin_hook_index.setdefault(plugin_id, [])
+        touched = set()
+
+        # Hook methods and overridden handlers, collected when the class was defined
+        for event_type, name in plugin._hook_table:
+            handler = getattr(plugin, name)
+            self._event_hooks_mutable.setdefault(event_type, []).append(handler)
+            registered.append((event_type, handler))
+            touched.add(event_type)
+
+        for event_type in touched:
+            self._publish_hooks(event_type)
+
+    def _publish_hooks(self, event_type: str) -> None:
+        """Replace the snapshot emit_event iterates for one event type."""
+        hooks = self._event_hooks_mutable.get(event_type)
+        if hooks:
+            # Sorted here, once per change; stable, so ties keep load order
+            hooks.sort(key=_hook_priority)
+            self.event_hooks[event_type] = tuple(hooks)
+        else:
+            self._event_hooks_mutable.pop(event_type, None)
+            self.event_hooks.pop(event_type, None)
+        self._hook_cache_version += 1
 
     def unload_plugin(self, plugin_id: str) -> bool:
         """Unload a plugin."""
@@ -269,31 +568,48 @@ class PluginManager:
                 del self.enabled_plugins[plugin_id]
             if plugin_id in self.disabled_plugins:
                 del self.disabled_plugins[plugin_id]
-
-            # Remove event hooks
-            for event_type, hooks in self.event_hooks.items():
-                self.event_hooks[event_type] = [
-                    hook for hook in hooks
-                    if not hasattr(hook, '__self__') or hook.__self__ != plugin
+            self._unindex_enabled(plugin)
+
+            # Remove event hooks; only the events this plugin hooked are
+            # touched, and an emit in progress keeps its old snapshot
+            removed: Dict[str, List[Callable]] = {}
+            for event_type, handler in self._plugin_hook_index.pop(plugin_id, ()):
+                removed.setdefault(event_type, []).append(handler)
+            for event_type, handlers in removed.items():
+                self._event_hooks_mutable[event_type] = [
+                    hook for hook in self._event_hooks_mutable.get(event_type, ())
+                    if not any(hook is handler for handler in handlers)
                 ]
+                self._publish_hooks(event_type)
 
-            self.logger.info(f"Unloaded plugin: {plugin.get_name()}")
+            self.logger.info("Unloaded plugin: %s", plugin.get_name())
             return True
 
         except Exception as e:
-            self.logger.error(f"Error unloading plugin {plugin_id}: {e}")
+            self.logger.error("Error unloading plugin %s: %s", plugin_id, e)
             return False
 
     def emit_event(self, event_type: str, **kwargs):
         """Emit an event to all registered hooks."""
-        if event_type not in self.event_hooks:
+        # A deferred plugin may hook this event; finish loading before dispatch
+        if self._pending_plugins:
+            self.load_pending_plugins()
+        if self._pending_by_event:
+            batch = self._pending_by_event.pop(event_type, None)
+            if batch:
+                self._load_deferred(batch)
+
+        # Single lookup; most events have no subscribers at all
+        hooks = self.event_hooks.get(event_type)
+        if not hooks:
             return
 
-        for hook in self.event_hooks[event_type]:
+        log_error = self.logger.error
+        for hook in hooks:
             try:
                 hook(**kwargs)
             except Exception as e:
-                self.logger.error(f"Error in plugin hook for {event_type}: {e}")
+                log_error("Error in plugin hook for %s: %s", event_type, e)
 
     def get_plugin(self, plugin_id: str) -> Optional[PluginBase]:
         """Get a plugin by ID."""
@@ -303,6 +619,24 @@ class PluginManager:
         """Get all enabled plugins."""
         return self.enabled_plugins.copy()
 
+    def get_ui_plugins(self) -> List[PluginBase]:
+        """Get enabled plugins that provide menu items."""
+        return list(self._ui_plugins)
+
+    def get_theme_names(self) -> Tuple[str, ...]:
+        """Get the names of themes provided by enabled plugins."""
+        # Which deferred plugins provide themes is only known once imported
+        if self._pending_plugins or self._pending_by_name:
+            self._load_deferred(list(self._iter_pending()))
+            self._pending_plugins.clear()
+        if self._theme_names is None:
+            names = []
+            for plugin in self.enabled_plugins.values():
+                if hasattr(plugin, 'get_themes'):
+                    names.extend(plugin.get_themes().keys())
+            self._theme_names = tuple(names)
+        return self._theme_names
+
     def get_disabled_plugins(self) -> Dict[str, PluginBase]:
         """Get all disabled plugins."""
         return self.disabled_plugins.copy()
@@ -311,22 +645,30 @@ class PluginManager:
         """Enable a plugin."""
         plugin = self.disabled_plugins.get(plugin_id)
         if not plugin:
+            # A plugin still waiting to load is loaded, and so enabled, now
+            for plugin_config in self._iter_pending():
+                if plugin_config['id'] == plugin_id:
+                    self._pending_plugins = [config for config in self._pending_plugins
+                                             if config is not plugin_config]
+                    self._load_deferred([plugin_config])
+                    return plugin_id in self.enabled_plugins
             return False
 
         if not self._check_dependencies(plugin):
-            self.logger.warning(f"Cannot enable plugin {plugin_id}: unmet dependencies")
+            self.logger.warning("Cannot enable plugin %s: unmet dependencies", plugin_id)
             return False
 
         plugin.set_enabled(True)
         self.enabled_plugins[plugin_id] = plugin
         del self.disabled_plugins[plugin_id]
+        self._index_enabled(plugin)
 
         try:
             plugin.on_load()
-            self.logger.info(f"Enabled plugin: {plugin.get_name()}")
+            self.logger.info("Enabled plugin: %s", plugin.get_name())
             return True
         except Exception as e:
-            self.logger.error(f"Error enabling plugin {plugin_id}: {e}")
+            self.logger.error("Error enabling plugin %s: %s", plugin_id, e)
             return False
 
     def disable_plugin(self, plugin_id: str) -> bool:
@@ -338,8 +680,9 @@ class PluginManager:
         plugin.set_enabled(False)
         self.disabled_plugins[plugin_id] = plugin
         del self.enabled_plugins[plugin_id]
+        self._unindex_enabled(plugin)
 
-        self.logger.info(f"Disabled plugin: {plugin.get_name()}")
+        self.logger.info("Disabled plugin: %s", plugin.get_name())
         return True
 
     def reload_plugin(self, plugin_id: str) -> bool:
@@ -363,7 +706,8 @@ class PluginManager:
                 'version': plugin.get_version(),
                 'description': plugin.get_description(),
                 'author': plugin.get_author(),
-                'enabled': True
+                'enabled': True,
+                'loaded': True
             })
 
         for plugin_id, plugin in self.disabled_plugins.items():
@@ -373,7 +717,21 @@ class PluginManager:
                 'version': plugin.get_version(),
                 'description': plugin.get_description(),
                 'author': plugin.get_author(),
-                'enabled': False
+                'enabled': False,
+                'loaded': True
+            })
+
+        # Deferred plugins show up before their first event loads them, with
+        # the state they will load in
+        for plugin_config in self._iter_pending():
+            plugins.append({
+                'id': plugin_config['id'],
+                'name': plugin_config['name'],
+                'version': plugin_config.get('version', ''),
+                'description': plugin_config.get('description', ''),
+                'author': plugin_config.get('author', 'Unknown'),
+                'enabled': plugin_config.get('enabled', True),
+                'loaded': False
             })
 
         return plugins
@@ -382,7 +740,7 @@ class PluginManager:
         """Install a plugin from a file or URL."""
         # TODO: Implement plugin installation
         # This would handle downloading, extracting, and validating plugins
-        self.logger.info(f"Plugin installation not yet implemented: {plugin_path}")
+        self.logger.info("Plugin installation not yet implemented: %s", plugin_path)
         return False
 
     def uninstall_plugin(self, plugin_id: str) -> bool:
@@ -391,27 +749,26 @@ class PluginManager:
         if not plugin:
             return False
 
-        # Get plugin path
-        plugin_path = getattr(plugin, '_plugin_path', None)
+        plugin_path = plugin._plugin_path
         if not plugin_path:
             return False
 
         try:
             # Remove plugin directory
-            import shutil
             shutil.rmtree(plugin_path)
 
             # Remove config
-            config_file = os.path.join(self.config_dir, f"plugin_{plugin_id}.json")
-            if os.path.exists(config_file):
-                os.remove(config_file)
+            try:
+                os.remove(os.path.join(self.config_dir, f"plugin_{plugin_id}.json"))
+            except FileNotFoundError:
+                pass
 
             # Unload plugin
             self.unload_plugin(plugin_id)
 
-            self.logger.info(f"Uninstalled plugin: {plugin.get_name()}")
+            self.logger.info("Uninstalled plugin: %s", plugin.get_name())
             return True
 
-        except Exception as e:
-            self.logger.error(f"Error uninstalling plugin {plugin_id}: {e}")
+        except OSError as e:
+            self.logger.error("Error uninstalling plugin %s: %s", plugin_id, e)
             return False
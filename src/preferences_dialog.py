@@ -1,3 +1,4 @@
+"""
 NewTerm Preferences Dialog Module
 
 Copyright (C) 2024 NewTerm Team
@@ -18,19 +19,90 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import gi
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk, Pango
+from gi.repository import Gtk, Gdk, GLib, Pango
+import copy
 import json
 import os
-from typing import Dict, Any, List, Optional, Callable
-from config import Config
-from keybinding_manager import KeyBindingManager
-from plugin_manager import PluginManager
+import re
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, List, Optional, Callable, Tuple, TYPE_CHECKING
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    from config import Config
+    from keybinding_manager import KeyBindingManager
+    from plugin_manager import PluginManager
+
+_BUILTIN_THEMES = ("Default", "Dark", "Light", "Solarized Dark", "Solarized Light")
+
+@lru_cache(maxsize=1)
+def _sorted_themes(plugin_themes: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Dict[str, int]]:
+    """Sort built-in and plugin theme names and index each name's first position."""
+    themes = tuple(sorted(_BUILTIN_THEMES + plugin_themes))
+    indexes: Dict[str, int] = {}
+    for index, name in enumerate(themes):
+        indexes.setdefault(name, index)
+    return themes, indexes
+
+# Static tab layouts, parsed by Gtk.Builder in C rather than built widget by widget
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "preferences.ui"),
+          encoding="utf-8") as _ui_file:
+    _PREFERENCES_UI = _ui_file.read()
+
+# "Ctrl+Shift+T"-style modifiers, rewritten to the "<Ctrl><Shift>T" form
+# Gtk.accelerator_parse expects
+_ACCEL_MODIFIER_RE = re.compile(
+    r'\b(ctrl|control|primary|shift|alt|super|cmd|command|meta)\s*\+\s*', re.IGNORECASE)
+_ACCEL_MODIFIERS = {
+    'ctrl': '<Ctrl>', 'control': '<Ctrl>', 'primary': '<Primary>',
+    'shift': '<Shift>', 'alt': '<Alt>', 'super': '<Super>',
+    'cmd': '<Super>', 'command': '<Super>', 'meta': '<Meta>',
+}
+
+def _canonical_accel(text: str) -> str:
+    """Rewrite a user-typed key combination into accelerator syntax."""
+    return _ACCEL_MODIFIER_RE.sub(
+        lambda match: _ACCEL_MODIFIERS[match.group(1).lower()], text.strip())
+
+# Parsed colors by their config string
+_RGBA_CACHE: Dict[str, Gdk.RGBA] = {}
+
+def _parse_rgba(spec: str) -> Gdk.RGBA:
+    """Parse a color string, reusing earlier parses of the same string."""
+    rgba = _RGBA_CACHE.get(spec)
+    if rgba is None:
+        rgba = Gdk.RGBA()
+        rgba.parse(spec)
+        _RGBA_CACHE[spec] = rgba
+    # Hand out a copy, since the caller's widget may change it
+    return rgba.copy()
 
 class PreferencesDialog:
     """Advanced preferences dialog for NewTerm."""
 
-    def __init__(self, parent_window: Gtk.Window, config: Config,
-                 keybinding_manager: KeyBindingManager, plugin_manager: PluginManager):
+    # Notebook pages in order; each is built by _create_<key>_tab on first view
+    _TABS = (
+        ("general", "General"),
+        ("appearance", "Appearance"),
+        ("keybindings", "Keybindings"),
+        ("plugins", "Plugins"),
+        ("advanced", "Advanced"),
+    )
+    # How long result messages stay in the info bar
+    _FLASH_MS = 3000
+    # Tree view rows appended per idle callback
+    _FILL_CHUNK = 256
+    # Store column indexes, for inserting whole rows in one call
+    _KEYBINDING_COLUMNS = [0, 1, 2, 3]
+    _PLUGIN_COLUMNS = [0, 1, 2, 3, 4, 5]
+
+    def __init__(self, parent_window: Gtk.Window, config: 'Config',
+                 keybinding_manager: 'KeyBindingManager', plugin_manager: 'PluginManager'):
         self.parent = parent_window
         self.config = config
         self.keybinding_manager = keybinding_manager
@@ -41,19 +113,43 @@ class PreferencesDialog:
         # UI components
         self.ui_theme_combo = None
         self.theme_combo = None
+        # Theme names the theme combo currently lists
+        self._theme_names: Tuple[str, ...] = ()
         self.font_family_entry = None
         self.font_size_spin = None
+        # Theme config key -> color button editing it
+        self._color_buttons: Dict[str, Gtk.ColorButton] = {}
         self.keybinding_tree = None
         self.keybinding_store = None
+        self._keybinding_filter = None
+        self._keybinding_model = None
+        self._keybinding_query = ""
         self.plugin_tree = None
         self.plugin_store = None
+        # Plugin info as of the last _load_plugins, in order and by name
+        self._plugin_infos: List[Dict[str, Any]] = []
+        self._plugin_by_name: Dict[str, Dict[str, Any]] = {}
+        self._built_tabs = set()
+        # Store name -> idle source still filling it
+        self._fill_sources: Dict[str, int] = {}
+        self._infobar = None
+        self._infobar_label = None
+        self._infobar_timeout = None
 
         # Callbacks
         self.on_config_changed: Optional[Callable] = None
 
     def show(self):
         """Show the preferences dialog."""
-        self.current_config = json.loads(json.dumps(self.config.config))  # Deep copy
+        self.current_config = copy.deepcopy(self.config.config)
+
+        # Reopening reuses the hidden dialog; only widget values are reset
+        if self.dialog is not None:
+            for key, _label in self._TABS:
+                if key in self._built_tabs:
+                    getattr(self, f"_refresh_{key}_tab")()
+            self.dialog.present()
+            return
 
         self.dialog = Gtk.Dialog(
             title="Preferences",
@@ -69,77 +165,125 @@ class PreferencesDialog:
         notebook = Gtk.Notebook()
         notebook.set_tab_pos(Gtk.PositionType.LEFT)
 
-        # General tab
-        general_tab = self._create_general_tab()
-        notebook.append_page(general_tab, Gtk.Label(label="General"))
-
-        # Appearance tab
-        appearance_tab = self._create_appearance_tab()
-        notebook.append_page(appearance_tab, Gtk.Label(label="Appearance"))
-
-        # Keybindings tab
-        keybindings_tab = self._create_keybindings_tab()
-        notebook.append_page(keybindings_tab, Gtk.Label(label="Keybindings"))
-
-        # Plugins tab
-        plugins_tab = self._create_plugins_tab()
-        notebook.append_page(plugins_tab, Gtk.Label(label="Plugins"))
-
-        # Advanced tab
-        advanced_tab = self._create_advanced_tab()
-        notebook.append_page(advanced_tab, Gtk.Label(label="Advanced"))
-
-        self.dialog.get_content_area().pack_start(notebook, True, True, 0)
+        # Empty pages for now; tabs are built when first switched to
+        self._built_tabs = set()
+        for _key, label in self._TABS:
+            notebook.append_page(Gtk.Box(), Gtk.Label(label=label))
+        self._build_tab(notebook, 0)
+
+        # Result messages are shown in place rather than in extra dialogs
+        self._infobar = Gtk.InfoBar()
+        self._infobar.set_show_close_button(True)
+        self._infobar.connect("response", lambda infobar, response: infobar.set_revealed(False))
+        self._infobar_label = Gtk.Label()
+        self._infobar_label.set_xalign(0)
+        self._infobar.get_content_area().pack_start(self._infobar_label, True, True, 0)
+
+        content_area = self.dialog.get_content_area()
+        content_area.pack_start(self._infobar, False, False, 0)
+        content_area.pack_start(notebook, True, True, 0)
         self.dialog.show_all()
+        self._infobar.set_revealed(False)
 
         # Connect signals
+        notebook.connect("switch-page", self._on_switch_page)
         self.dialog.connect("response", self._on_response)
+        self.dialog.connect("delete-event", lambda dialog, event: dialog.hide_on_delete())
+
+    def _flash(self, text: str, message_type: Gtk.MessageType):
+        """Show a message in the dialog's info bar for a few seconds."""
+        self._infobar.set_message_type(message_type)
+        self._infobar_label.set_text(text)
+        self._infobar.set_revealed(True)
+
+        if self._infobar_timeout is not None:
+            GLib.source_remove(self._infobar_timeout)
+        self._infobar_timeout = GLib.timeout_add(self._FLASH_MS, self._hide_infobar)
+
+    def _hide_infobar(self) -> bool:
+        """Hide the info bar once its message has timed out."""
+        self._infobar_timeout = None
+        self._infobar.set_revealed(False)
+        return False
+
+    def _on_switch_page(self, notebook, page, page_num):
+        """Build a notebook tab the first time it is shown."""
+        self._build_tab(notebook, page_num)
+
+    def _build_tab(self, notebook: Gtk.Notebook, page_num: int):
+        """Fill a placeholder notebook page with its tab contents."""
+        key = self._TABS[page_num][0]
+        if key in self._built_tabs:
+            return
+        self._built_tabs.add(key)
+
+        tab = getattr(self, f"_create_{key}_tab")()
+        notebook.get_nth_page(page_num).pack_start(tab, True, True, 0)
+        tab.show_all()
+
+    def _load_ui(self, *object_ids: str) -> Gtk.Builder:
+        """Build objects from the preferences UI definition."""
+        builder = Gtk.Builder()
+        builder.add_objects_from_string(_PREFERENCES_UI, list(object_ids))
+        return builder
+
+    def _refresh_general_tab(self):
+        """Reset the general tab's widgets from the current config."""
+        config = self.current_config
+        self.restore_session_check.set_active(config.get('restore_session', True))
+        self.show_menu_bar_check.set_active(config.get('show_menu_bar', True))
+        self.gpu_acceleration_check.set_active(config.get('gpu_acceleration', True))
+        self.scrollback_spin.set_value(config.get('scrollback_lines', 1000))
+
+    def _refresh_appearance_tab(self):
+        """Reset the appearance tab's widgets from the current config."""
+        config = self.current_config
+        ui_themes = self._get_available_ui_themes()
+        ui_theme_indexes = {name: index for index, name in enumerate(ui_themes)}
+        self.ui_theme_combo.set_active(ui_theme_indexes.get(config.get('ui_theme', 'Default'), 0))
+
+        # Plugins may have been enabled or disabled since the tab was built
+        themes, theme_indexes = self._get_available_themes()
+        if themes is not self._theme_names:
+            self._theme_names = themes
+            self.theme_combo.set_model(self._create_name_store(themes))
+        self.theme_combo.set_active(theme_indexes.get(config.get('theme_name', 'Default'), 0))
+
+        theme = config.get('theme', {})
+        for config_key, button in self._color_buttons.items():
+            button.set_rgba(_parse_rgba(theme.get(config_key, '#000000')))
+
+        font = config.get('font', {})
+        self.font_family_entry.set_text(font.get('family', 'Monospace'))
+        self.font_size_spin.set_value(font.get('size', 12))
+
+    def _refresh_keybindings_tab(self):
+        """Reload the keybindings list."""
+        self._load_keybindings()
 
-    def _create_general_tab(self) -> Gtk.Widget:
-        """Create the general preferences tab."""
-        frame = Gtk.Frame(label="General Settings")
-        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        vbox.set_border_width(10)
-        frame.add(vbox)
-
-        # Startup options
-        startup_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
-
-        self.restore_session_check = Gtk.CheckButton(label="Restore previous session on startup")
-        self.restore_session_check.set_active(self.current_config.get('restore_session', True))
-        startup_box.pack_start(self.restore_session_check, False, False, 0)
-
-        self.show_menu_bar_check = Gtk.CheckButton(label="Show menu bar")
-        self.show_menu_bar_check.set_active(self.current_config.get('show_menu_bar', True))
-        startup_box.pack_start(self.show_menu_bar_check, False, False, 0)
-
-        self.gpu_acceleration_check = Gtk.CheckButton(label="Enable GPU acceleration")
-        self.gpu_acceleration_check.set_active(self.current_config.get('gpu_acceleration', True))
-        startup_box.pack_start(self.gpu_acceleration_check, False, False, 0)
-
-        vbox.pack_start(startup_box, False, False, 0)
-
-        # Scrollback lines
-        scrollback_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        scrollback_label = Gtk.Label(label="Scrollback lines:")
-        scrollback_label.set_xalign(0)
-
-        scrollback_adj = Gtk.Adjustment(
-            value=self.current_config.get('scrollback_lines', 1000),
-            lower=100,
-            upper=100000,
-            step_increment=100,
-            page_increment=1000
-        )
-        self.scrollback_spin = Gtk.SpinButton(adjustment=scrollback_adj)
-        self.scrollback_spin.set_digits(0)
+    def _refresh_plugins_tab(self):
+        """Reload the plugins list."""
+        self._load_plugins()
 
-        scrollback_box.pack_start(scrollback_label, False, False, 0)
-        scrollback_box.pack_start(self.scrollback_spin, False, False, 0)
+    def _refresh_advanced_tab(self):
+        """Reset the advanced tab's widgets from the current config."""
+        config = self.current_config
+        self.audible_bell_check.set_active(config.get('audible_bell', False))
+        self.urgent_bell_check.set_active(config.get('urgent_bell', True))
+        self.mouse_autohide_check.set_active(config.get('mouse_autohide', False))
+        self.debug_mode_check.set_active(config.get('debug_mode', False))
+        self.log_commands_check.set_active(config.get('log_commands', False))
 
-        vbox.pack_start(scrollback_box, False, False, 0)
+    def _create_general_tab(self) -> Gtk.Widget:
+        """Create the general preferences tab."""
+        builder = self._load_ui("general_tab", "scrollback_adjustment")
+        self.restore_session_check = builder.get_object("restore_session_check")
+        self.show_menu_bar_check = builder.get_object("show_menu_bar_check")
+        self.gpu_acceleration_check = builder.get_object("gpu_acceleration_check")
+        self.scrollback_spin = builder.get_object("scrollback_spin")
 
-        return frame
+        self._refresh_general_tab()
+        return builder.get_object("general_tab")
 
     def _create_appearance_tab(self) -> Gtk.Widget:
         """Create the appearance preferences tab."""
@@ -153,13 +297,12 @@ class PreferencesDialog:
         ui_theme_label = Gtk.Label(label="UI Theme:")
         ui_theme_label.set_xalign(0)
 
-        self.ui_theme_combo = Gtk.ComboBoxText()
         ui_themes = self._get_available_ui_themes()
-        for theme_name in ui_themes:
-            self.ui_theme_combo.append_text(theme_name)
+        self.ui_theme_combo = self._create_name_combo(ui_themes)
 
         current_ui_theme = self.current_config.get('ui_theme', 'Default')
-        self.ui_theme_combo.set_active(ui_themes.index(current_ui_theme) if current_ui_theme in ui_themes else 0)
+        ui_theme_indexes = {name: index for index, name in enumerate(ui_themes)}
+        self.ui_theme_combo.set_active(ui_theme_indexes.get(current_ui_theme, 0))
 
         ui_theme_box.pack_start(ui_theme_label, False, False, 0)
         ui_theme_box.pack_start(self.ui_theme_combo, False, False, 0)
@@ -170,13 +313,12 @@ class PreferencesDialog:
         theme_label = Gtk.Label(label="Terminal Theme:")
         theme_label.set_xalign(0)
 
-        self.theme_combo = Gtk.ComboBoxText()
-        themes = self._get_available_themes()
-        for theme_name in themes:
-            self.theme_combo.append_text(theme_name)
+        themes, theme_indexes = self._get_available_themes()
+        self._theme_names = themes
+        self.theme_combo = self._create_name_combo(themes)
 
         current_theme = self.current_config.get('theme_name', 'Default')
-        self.theme_combo.set_active(themes.index(current_theme) if current_theme in themes else 0)
+        self.theme_combo.set_active(theme_indexes.get(current_theme, 0))
 
         theme_box.pack_start(theme_label, False, False, 0)
         theme_box.pack_start(self.theme_combo, False, False, 0)
@@ -194,6 +336,7 @@ class PreferencesDialog:
             ("Cursor", "cursor_color")
         ]
 
+        theme = self.current_config.get('theme', {})
         for label_text, config_key in colors:
             color_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
             color_label = Gtk.Label(label=f"{label_text}:")
@@ -201,11 +344,9 @@ class PreferencesDialog:
             color_label.set_width_chars(12)
 
             color_button = Gtk.ColorButton()
-            color = Gdk.RGBA()
-            color.parse(self.current_config.get('theme', {}).get(config_key, '#000000'))
-            color_button.set_rgba(color)
+            color_button.set_rgba(_parse_rgba(theme.get(config_key, '#000000')))
 
-            setattr(self, f"{config_key}_button", color_button)
+            self._color_buttons[config_key] = color_button
             color_box.pack_start(color_label, False, False, 0)
             color_box.pack_start(color_button, False, False, 0)
             theme_editor_vbox.pack_start(color_box, False, False, 0)
@@ -260,29 +401,37 @@ class PreferencesDialog:
         vbox.set_border_width(10)
         frame.add(vbox)
 
+        # Search box, filtering the rows below as the user types
+        search_entry = Gtk.SearchEntry()
+        search_entry.connect("search-changed", self._on_keybinding_search_changed)
+        vbox.pack_start(search_entry, False, False, 0)
+
         # Keybinding tree view
         scrolled = Gtk.ScrolledWindow()
         scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         scrolled.set_min_content_height(300)
 
         self.keybinding_store = Gtk.ListStore(str, str, str, str)  # action, key, description, category
+        self._keybinding_query = ""
+        self._keybinding_filter = self.keybinding_store.filter_new()
+        self._keybinding_filter.set_visible_func(self._keybinding_visible)
+        self._keybinding_model = Gtk.TreeModelSort(model=self._keybinding_filter)
 
-        self.keybinding_tree = Gtk.TreeView(model=self.keybinding_store)
+        self.keybinding_tree = Gtk.TreeView(model=self._keybinding_model)
         self.keybinding_tree.set_headers_visible(True)
+        self.keybinding_tree.connect("destroy", lambda tree: self._cancel_fill("keybindings"))
 
-        # Columns
-        renderer = Gtk.CellRendererText()
-        renderer.set_property("editable", True)
-        renderer.connect("edited", self._on_keybinding_edited)
+        # Columns; only the key combination is editable
+        read_only_renderer = Gtk.CellRendererText()
+        key_renderer = Gtk.CellRendererText()
+        key_renderer.set_property("editable", True)
+        key_renderer.connect("edited", self._on_keybinding_edited)
 
         for i, title in enumerate(["Action", "Key Combination", "Description", "Category"]):
+            renderer = key_renderer if i == 1 else read_only_renderer
             column = Gtk.TreeViewColumn(title, renderer, text=i)
             column.set_resizable(True)
-            if i == 1:  # Key combination column is editable
-                column.add_attribute(renderer, "editable", 3)  # Use column 3 for editable flag
-                renderer = Gtk.CellRendererText()
-                renderer.set_property("editable", True)
-                renderer.connect("edited", self._on_keybinding_edited)
+            column.set_sort_column_id(i)
             self.keybinding_tree.append_column(column)
 
         scrolled.add(self.keybinding_tree)
@@ -322,21 +471,24 @@ class PreferencesDialog:
         scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         scrolled.set_min_content_height(300)
 
-        self.plugin_store = Gtk.ListStore(bool, str, str, str, str)  # enabled, name, version, description, author
+        self.plugin_store = Gtk.ListStore(bool, str, str, str, str, bool)  # enabled, name, version, description, author, loaded
 
         self.plugin_tree = Gtk.TreeView(model=self.plugin_store)
+        self.plugin_tree.connect("destroy", lambda tree: self._cancel_fill("plugins"))
         self.plugin_tree.set_headers_visible(True)
 
         # Columns
         renderer = Gtk.CellRendererToggle()
         renderer.connect("toggled", self._on_plugin_toggled)
 
-        column = Gtk.TreeViewColumn("Enabled", renderer, active=0)
+        # Plugins still waiting for their first event are greyed out and
+        # can't be toggled until they have loaded
+        column = Gtk.TreeViewColumn("Enabled", renderer, active=0, activatable=5, sensitive=5)
         self.plugin_tree.append_column(column)
 
         for i, title in enumerate(["Name", "Version", "Description", "Author"], 1):
             renderer = Gtk.CellRendererText()
-            column = Gtk.TreeViewColumn(title, renderer, text=i)
+            column = Gtk.TreeViewColumn(title, renderer, text=i, sensitive=5)
             column.set_resizable(True)
             self.plugin_tree.append_column(column)
 
@@ -367,141 +519,185 @@ class PreferencesDialog:
 
     def _create_advanced_tab(self) -> Gtk.Widget:
         """Create the advanced preferences tab."""
-        frame = Gtk.Frame(label="Advanced Settings")
-        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        vbox.set_border_width(10)
-        frame.add(vbox)
-
-        # Performance settings
-        perf_frame = Gtk.Frame(label="Performance")
-        perf_vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
-        perf_vbox.set_border_width(5)
-
-        self.audible_bell_check = Gtk.CheckButton(label="Audible bell")
-        self.audible_bell_check.set_active(self.current_config.get('audible_bell', False))
-        perf_vbox.pack_start(self.audible_bell_check, False, False, 0)
-
-        self.urgent_bell_check = Gtk.CheckButton(label="Urgent bell")
-        self.urgent_bell_check.set_active(self.current_config.get('urgent_bell', True))
-        perf_vbox.pack_start(self.urgent_bell_check, False, False, 0)
-
-        self.mouse_autohide_check = Gtk.CheckButton(label="Auto-hide mouse cursor")
-        self.mouse_autohide_check.set_active(self.current_config.get('mouse_autohide', False))
-        perf_vbox.pack_start(self.mouse_autohide_check, False, False, 0)
-
-        perf_frame.add(perf_vbox)
-        vbox.pack_start(perf_frame, False, False, 0)
-
-        # Debug settings
-        debug_frame = Gtk.Frame(label="Debug")
-        debug_vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
-        debug_vbox.set_border_width(5)
-
-        self.debug_mode_check = Gtk.CheckButton(label="Enable debug mode")
-        self.debug_mode_check.set_active(self.current_config.get('debug_mode', False))
-        debug_vbox.pack_start(self.debug_mode_check, False, False, 0)
-
-        self.log_commands_check = Gtk.CheckButton(label="Log commands")
-        self.log_commands_check.set_active(self.current_config.get('log_commands', False))
-        debug_vbox.pack_start(self.log_commands_check, False, False, 0)
-
-        debug_frame.add(debug_vbox)
-        vbox.pack_start(debug_frame, False, False, 0)
-
-        return frame
+        builder = self._load_ui("advanced_tab")
+        self.audible_bell_check = builder.get_object("audible_bell_check")
+        self.urgent_bell_check = builder.get_object("urgent_bell_check")
+        self.mouse_autohide_check = builder.get_object("mouse_autohide_check")
+        self.debug_mode_check = builder.get_object("debug_mode_check")
+        self.log_commands_check = builder.get_object("log_commands_check")
+
+        self._refresh_advanced_tab()
+        return builder.get_object("advanced_tab")
+
+    def _create_name_combo(self, names) -> Gtk.ComboBox:
+        """Create a combo box over a single-column store of names."""
+        combo = Gtk.ComboBox.new_with_model(self._create_name_store(names))
+        renderer = Gtk.CellRendererText()
+        combo.pack_start(renderer, True)
+        combo.add_attribute(renderer, "text", 0)
+        return combo
+
+    def _create_name_store(self, names) -> Gtk.ListStore:
+        """Create a single-column store holding names."""
+        # Filled before any combo is attached, so rows cause no view updates
+        store = Gtk.ListStore(str)
+        insert = store.insert_with_valuesv
+        for name in names:
+            insert(-1, [0], [name])
+        return store
 
     def _get_available_ui_themes(self) -> List[str]:
         """Get list of available UI themes."""
         return ["Default", "Dark", "OLED"]
 
-    def _get_available_themes(self) -> List[str]:
-        """Get list of available themes."""
-        themes = ["Default", "Dark", "Light", "Solarized Dark", "Solarized Light"]
-
-        # Add themes from plugins
-        for plugin in self.plugin_manager.get_enabled_plugins().values():
-            if hasattr(plugin, 'get_themes'):
-                plugin_themes = plugin.get_themes()
-                themes.extend(plugin_themes.keys())
-
-        return sorted(themes)
+    def _get_available_themes(self) -> Tuple[Tuple[str, ...], Dict[str, int]]:
+        """Get the sorted available themes and the index of each name."""
+        # Both caches are reused until the set of enabled plugins changes
+        return _sorted_themes(self.plugin_manager.get_theme_names())
 
     def _load_keybindings(self):
         """Load keybindings into the tree view."""
-        self.keybinding_store.clear()
-
-        for action, binding in self.keybinding_manager.get_all_bindings().items():
-            self.keybinding_store.append([
-                action,
-                binding.key_combo,
-                binding.description,
-                binding.category
-            ])
+        rows = [[action, binding.key_combo, binding.description, binding.category]
+                for action, binding in self.keybinding_manager.get_all_bindings().items()]
+        self._fill_store("keybindings", self.keybinding_tree, self.keybinding_store,
+                         self._keybinding_model, self._KEYBINDING_COLUMNS, rows)
+
+    def _fill_store(self, key: str, tree: Gtk.TreeView, store: Gtk.ListStore,
+                    model: Gtk.TreeModel, columns: List[int], rows: List[list]):
+        """Replace a store's rows, adding the first chunk now and the rest while idle."""
+        self._cancel_fill(key)
+        # Detach the view so it doesn't react to each row of the first chunk.
+        # Later chunks go in attached, so they don't reset the scroll
+        # position, selection or an edit the user started meanwhile.
+        tree.set_model(None)
+        store.clear()
+
+        rows = iter(rows)
+        more = self._append_chunk(key, store, columns, rows)
+        tree.set_model(model)
+        if more:
+            self._fill_sources[key] = GLib.idle_add(
+                self._append_chunk, key, store, columns, rows)
+
+    def _append_chunk(self, key: str, store: Gtk.ListStore, columns: List[int], rows) -> bool:
+        """Append the next chunk of rows to a store; return True while rows remain."""
+        insert = store.insert_with_valuesv
+        count = 0
+        for row in islice(rows, self._FILL_CHUNK):
+            # One C call per row, skipping the per-value conversion of append()
+            insert(-1, columns, row)
+            count += 1
+
+        if count < self._FILL_CHUNK:
+            self._fill_sources.pop(key, None)
+            return False
+        return True
+
+    def _cancel_fill(self, key: str):
+        """Stop filling a store from idle callbacks."""
+        source = self._fill_sources.pop(key, None)
+        if source is not None:
+            GLib.source_remove(source)
+
+    def _keybinding_visible(self, model, iter, data) -> bool:
+        """Check whether a keybinding row matches the search query."""
+        query = self._keybinding_query
+        if not query:
+            return True
+        return any(query in (model.get_value(iter, column) or "").lower()
+                   for column in range(4))
+
+    def _on_keybinding_search_changed(self, entry):
+        """Refilter the keybindings for the new search text."""
+        self._keybinding_query = entry.get_text().strip().lower()
+        self._keybinding_filter.refilter()
+
+    def _keybinding_store_iter(self, path) -> Gtk.TreeIter:
+        """Map a path in the sorted, filtered view to an iter in the store."""
+        sorted_iter = self._keybinding_model.get_iter(path)
+        filter_iter = self._keybinding_model.convert_iter_to_child_iter(sorted_iter)
+        return self._keybinding_filter.convert_iter_to_child_iter(filter_iter)
 
     def _load_plugins(self):
         """Load plugins into the tree view."""
-        self.plugin_store.clear()
-
-        for plugin_info in self.plugin_manager.get_plugin_info():
-            self.plugin_store.append([
-                plugin_info['enabled'],
+        self._plugin_infos = self.plugin_manager.get_plugin_info()
+        self._plugin_by_name = {}
+        rows = []
+        for plugin_info in self._plugin_infos:
+            # First plugin with a name wins, as the row lookups always did
+            self._plugin_by_name.setdefault(plugin_info['name'], plugin_info)
+            rows.append([
+                bool(plugin_info['enabled']),
                 plugin_info['name'],
                 plugin_info['version'],
                 plugin_info['description'],
-                plugin_info['author']
+                plugin_info['author'],
+                plugin_info.get('loaded', True)
             ])
 
+        self._fill_store("plugins", self.plugin_tree, self.plugin_store,
+                         self.plugin_store, self._PLUGIN_COLUMNS, rows)
+
     def _on_response(self, dialog, response_id):
         """Handle dialog response."""
         if response_id == Gtk.ResponseType.OK or response_id == Gtk.ResponseType.APPLY:
             self._apply_changes()
 
+        # Hidden rather than destroyed, so the next show() can reuse it
         if response_id == Gtk.ResponseType.OK or response_id == Gtk.ResponseType.CANCEL:
-            self.dialog.destroy()
+            self.dialog.hide()
 
     def _apply_changes(self):
         """Apply the changes to the configuration."""
-        # Update config with new values
-        self.current_config['restore_session'] = self.restore_session_check.get_active()
-        self.current_config['show_menu_bar'] = self.show_menu_bar_check.get_active()
-        self.current_config['gpu_acceleration'] = self.gpu_acceleration_check.get_active()
-        self.current_config['scrollback_lines'] = self.scrollback_spin.get_value_as_int()
-
-        # UI Theme settings
-        if self.ui_theme_combo:
-            ui_theme_iter = self.ui_theme_combo.get_active_iter()
-            if ui_theme_iter:
-                ui_theme_model = self.ui_theme_combo.get_model()
-                ui_theme_name = ui_theme_model[ui_theme_iter][0]
-                self.current_config['ui_theme'] = ui_theme_name
-
-        # Theme settings
-        if 'theme' not in self.current_config:
-            self.current_config['theme'] = {}
-
-        # Update colors
-        for color_key in ['background_color', 'foreground_color', 'cursor_color']:
-            button = getattr(self, f"{color_key}_button")
-            if button:
-                color = button.get_rgba()
-                self.current_config['theme'][color_key] = color.to_string()
-
-        # Font settings
-        if 'font' not in self.current_config:
-            self.current_config['font'] = {}
-
-        self.current_config['font']['family'] = self.font_family_entry.get_text()
-        self.current_config['font']['size'] = self.font_size_spin.get_value_as_int()
-
-        # Advanced settings
-        self.current_config['audible_bell'] = self.audible_bell_check.get_active()
-        self.current_config['urgent_bell'] = self.urgent_bell_check.get_active()
-        self.current_config['mouse_autohide'] = self.mouse_autohide_check.get_active()
-        self.current_config['debug_mode'] = self.debug_mode_check.get_active()
-        self.current_config['log_commands'] = self.log_commands_check.get_active()
-
-        # Save config
-        self.config.config = self.current_config
+        # Update config with new values; tabs never opened keep their values
+        if "general" in self._built_tabs:
+            self.current_config['restore_session'] = self.restore_session_check.get_active()
+            self.current_config['show_menu_bar'] = self.show_menu_bar_check.get_active()
+            self.current_config['gpu_acceleration'] = self.gpu_acceleration_check.get_active()
+            self.current_config['scrollback_lines'] = self.scrollback_spin.get_value_as_int()
+
+        if "appearance" in self._built_tabs:
+            # UI Theme settings
+            if self.ui_theme_combo:
+                ui_theme_iter = self.ui_theme_combo.get_active_iter()
+                if ui_theme_iter:
+                    ui_theme_model = self.ui_theme_combo.get_model()
+                    ui_theme_name = ui_theme_model[ui_theme_iter][0]
+                    self.current_config['ui_theme'] = ui_theme_name
+
+            # Theme settings
+            if 'theme' not in self.current_config:
+                self.current_config['theme'] = {}
+
+            # Update colors; unchanged ones keep their original spelling,
+            # since get_rgba() would turn "#000000" into "rgb(0,0,0)"
+            theme = self.current_config['theme']
+            for color_key, button in self._color_buttons.items():
+                rgba = button.get_rgba()
+                original = theme.get(color_key)
+                if original is None or not rgba.equal(_parse_rgba(original)):
+                    theme[color_key] = rgba.to_string()
+
+            # Font settings
+            if 'font' not in self.current_config:
+                self.current_config['font'] = {}
+
+            self.current_config['font']['family'] = self.font_family_entry.get_text()
+            self.current_config['font']['size'] = self.font_size_spin.get_value_as_int()
+
+        if "advanced" in self._built_tabs:
+            self.current_config['audible_bell'] = self.audible_bell_check.get_active()
+            self.current_config['urgent_bell'] = self.urgent_bell_check.get_active()
+            self.current_config['mouse_autohide'] = self.mouse_autohide_check.get_active()
+            self.current_config['debug_mode'] = self.debug_mode_check.get_active()
+            self.current_config['log_commands'] = self.log_commands_check.get_active()
+
+        # Nothing to save or reapply if the settings weren't changed
+        if self.current_config == self.config.config:
+            return
+
+        # Save config; keep a separate copy so later edits start unsaved
+        self.config.config = copy.deepcopy(self.current_config)
         self.config.save_config()
 
         # Notify listeners
@@ -510,8 +706,9 @@ class PreferencesDialog:
 
     def _on_keybinding_edited(self, widget, path, text):
         """Handle keybinding editing."""
-        iter = self.keybinding_store.get_iter(path)
+        iter = self._keybinding_store_iter(path)
         action = self.keybinding_store.get_value(iter, 0)
+        text = _canonical_accel(text)
 
         # Update the keybinding
         self.keybinding_manager.register_binding(
@@ -552,18 +749,15 @@ class PreferencesDialog:
                 filename += '.json'
 
             try:
-                with open(filename, 'w') as f:
-                    json.dump(self.keybinding_manager.export_bindings(), f, indent=2)
+                bindings = self.keybinding_manager.export_bindings()
+                if orjson is not None:
+                    data = orjson.dumps(bindings, option=orjson.OPT_INDENT_2)
+                else:
+                    data = json.dumps(bindings, indent=2).encode('utf-8')
+                with open(filename, 'wb') as f:
+                    f.write(data)
             except Exception as e:
-                error_dialog = Gtk.MessageDialog(
-                    parent=self.dialog,
-                    flags=0,
-                    message_type=Gtk.MessageType.ERROR,
-                    buttons=Gtk.ButtonsType.OK,
-                    text=f"Error exporting keybindings: {e}"
-                )
-                error_dialog.run()
-                error_dialog.destroy()
+                self._flash(f"Error exporting keybindings: {e}", Gtk.MessageType.ERROR)
 
         dialog.destroy()
 
@@ -587,8 +781,12 @@ class PreferencesDialog:
             filename = dialog.get_filename()
 
             try:
-                with open(filename, 'r') as f:
-                    bindings = json.load(f)
+                with open(filename, 'rb') as f:
+                    data = f.read()
+                if orjson is not None:
+                    bindings = orjson.loads(data)
+                else:
+                    bindings = json.loads(data)
 
                 # Apply imported bindings
                 for action, key_combo in bindings.items():
@@ -599,15 +797,7 @@ class PreferencesDialog:
                 self._load_keybindings()
 
             except Exception as e:
-                error_dialog = Gtk.MessageDialog(
-                    parent=self.dialog,
-                    flags=0,
-                    message_type=Gtk.MessageType.ERROR,
-                    buttons=Gtk.ButtonsType.OK,
-                    text=f"Error importing keybindings: {e}"
-                )
-                error_dialog.run()
-                error_dialog.destroy()
+                self._flash(f"Error importing keybindings: {e}", Gtk.MessageType.ERROR)
 
         dialog.destroy()
 
@@ -617,14 +807,12 @@ class PreferencesDialog:
         enabled = not self.plugin_store.get_value(iter, 0)
         name = self.plugin_store.get_value(iter, 1)
 
-        # Find plugin by name
-        for plugin_info in self.plugin_manager.get_plugin_info():
-            if plugin_info['name'] == name:
-                if enabled:
-                    self.plugin_manager.enable_plugin(plugin_info['id'])
-                else:
-                    self.plugin_manager.disable_plugin(plugin_info['id'])
-                break
+        plugin_info = self._plugin_by_name.get(name)
+        if plugin_info:
+            if enabled:
+                self.plugin_manager.enable_plugin(plugin_info['id'])
+            else:
+                self.plugin_manager.disable_plugin(plugin_info['id'])
 
         # Update store
         self.plugin_store.set_value(iter, 0, enabled)
@@ -650,26 +838,10 @@ class PreferencesDialog:
             filename = dialog.get_filename()
 
             if self.plugin_manager.install_plugin(filename):
-                info_dialog = Gtk.MessageDialog(
-                    parent=self.dialog,
-                    flags=0,
-                    message_type=Gtk.MessageType.INFO,
-                    buttons=Gtk.ButtonsType.OK,
-                    text="Plugin installed successfully!"
-                )
-                info_dialog.run()
-                info_dialog.destroy()
+                self._flash("Plugin installed successfully!", Gtk.MessageType.INFO)
                 self._load_plugins()
             else:
-                error_dialog = Gtk.MessageDialog(
-                    parent=self.dialog,
-                    flags=0,
-                    message_type=Gtk.MessageType.ERROR,
-                    buttons=Gtk.ButtonsType.OK,
-                    text="Failed to install plugin."
-                )
-                error_dialog.run()
-                error_dialog.destroy()
+                self._flash("Failed to install plugin.", Gtk.MessageType.ERROR)
 
         dialog.destroy()
 
@@ -680,51 +852,31 @@ class PreferencesDialog:
 
         if iter:
             name = model.get_value(iter, 1)
+            plugin_info = self._plugin_by_name.get(name)
 
-            # Find plugin by name
-            for plugin_info in self.plugin_manager.get_plugin_info():
-                if plugin_info['name'] == name:
-                    confirm_dialog = Gtk.MessageDialog(
-                        parent=self.dialog,
-                        flags=0,
-                        message_type=Gtk.MessageType.QUESTION,
-                        buttons=Gtk.ButtonsType.YES_NO,
-                        text=f"Are you sure you want to uninstall '{name}'?"
-                    )
+            if plugin_info:
+                confirm_dialog = Gtk.MessageDialog(
+                    parent=self.dialog,
+                    flags=0,
+                    message_type=Gtk.MessageType.QUESTION,
+                    buttons=Gtk.ButtonsType.YES_NO,
+                    text=f"Are you sure you want to uninstall '{name}'?"
+                )
+
+                response = confirm_dialog.run()
+                confirm_dialog.destroy()
 
-                    response = confirm_dialog.run()
-                    confirm_dialog.destroy()
-
-                    if response == Gtk.ResponseType.YES:
-                        if self.plugin_manager.uninstall_plugin(plugin_info['id']):
-                            info_dialog = Gtk.MessageDialog(
-                                parent=self.dialog,
-                                flags=0,
-                                message_type=Gtk.MessageType.INFO,
-                                buttons=Gtk.ButtonsType.OK,
-                                text="Plugin uninstalled successfully!"
-                            )
-                            info_dialog.run()
-                            info_dialog.destroy()
-                            self._load_plugins()
-                        else:
-                            error_dialog = Gtk.MessageDialog(
-                                parent=self.dialog,
-                                flags=0,
-                                message_type=Gtk.MessageType.ERROR,
-                                buttons=Gtk.ButtonsType.OK,
-                                text="Failed to uninstall plugin."
-                            )
-                            error_dialog.run()
-                            error_dialog.destroy()
-                    break
+                if response == Gtk.ResponseType.YES:
+                    if self.plugin_manager.uninstall_plugin(plugin_info['id']):
+                        self._flash("Plugin uninstalled successfully!", Gtk.MessageType.INFO)
+                        self._load_plugins()
+                    else:
+                        self._flash("Failed to uninstall plugin.", Gtk.MessageType.ERROR)
 
     def _on_reload_plugins(self, button):
         """Reload all plugins."""
         # Get plugin IDs to reload
-        plugin_ids = []
-        for plugin_info in self.plugin_manager.get_plugin_info():
-            plugin_ids.append(plugin_info['id'])
+        plugin_ids = [plugin_info['id'] for plugin_info in self._plugin_infos]
 
         # Reload each plugin
         for plugin_id in plugin_ids:
@@ -732,15 +884,7 @@ class PreferencesDialog:
 
         self._load_plugins()
 
-        info_dialog = Gtk.MessageDialog(
-            parent=self.dialog,
-            flags=0,
-            message_type=Gtk.MessageType.INFO,
-            buttons=Gtk.ButtonsType.OK,
-            text="Plugins reloaded successfully!"
-        )
-        info_dialog.run()
-        info_dialog.destroy()
+        self._flash("Plugins reloaded successfully!", Gtk.MessageType.INFO)
 
     def set_config_changed_callback(self, callback: Callable):
         """Set callback for when configuration changes."""
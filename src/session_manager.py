@@ -17,11 +17,26 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import copy
 import json
 import os
-from typing import Dict, Any, List, Optional
+import re
+import tempfile
+from typing import Dict, Any, List, Optional, Tuple
 from config import Config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parses JSON straight from bytes; orjson when available
+_loads = orjson.loads if orjson is not None else json.loads
+
+# The version key is written first, so it shows up in the file's first bytes
+_VERSION_PEEK = 64
+_VERSION_RE = re.compile(rb'"version"\s*:\s*"([^"]*)"')
+
 class SessionManager:
     """Manages terminal sessions (save/restore tabs and state)."""
 
@@ -29,12 +44,30 @@ class SessionManager:
         self.config = config
         self.session_file = os.path.expanduser("~/.config/newterm/session.json")
         self.auto_save = config.get('auto_save_session', True)
+        # Tabs and active index last written, to skip rewriting the same session
+        self._last_saved: Optional[Tuple[List[Dict[str, Any]], int]] = None
+        self._last_saved_durable = False
 
-    def save_session(self, tabs_data: List[Dict[str, Any]], active_tab_index: int = 0):
-        """Save current session to file."""
+    def save_session(self, tabs_data: List[Dict[str, Any]], active_tab_index: int = 0,
+                     durable: bool = False):
+        """Save current session to file, fsyncing it first if durable."""
         if not self.auto_save:
             return
 
+        # The timestamp alone changing isn't worth a rewrite; a durable save
+        # still goes through if the unchanged session was never fsynced
+        if (self._last_saved == (tabs_data, active_tab_index)
+                and (self._last_saved_durable or not durable)):
+            return
+
+        pretty = self.config.get('debug_mode', False)
+        if self._write_session(tabs_data, active_tab_index, pretty, durable):
+            self._last_saved = (copy.deepcopy(tabs_data), active_tab_index)
+            self._last_saved_durable = durable
+
+    def _write_session(self, tabs_data: List[Dict[str, Any]], active_tab_index: int,
+                       pretty: bool = False, durable: bool = False) -> bool:
+        """Encode and atomically write the session."""
         try:
             session_data = {
                 "version": "1.0",
@@ -43,26 +76,58 @@ class SessionManager:
                 "timestamp": self._get_timestamp()
             }
 
+            # Compact output unless debugging; encoded up front for one write
+            if orjson is not None:
+                data = orjson.dumps(session_data, option=orjson.OPT_INDENT_2 if pretty else 0)
+            elif pretty:
+                data = json.dumps(session_data, indent=2, ensure_ascii=False).encode('utf-8')
+            else:
+                data = json.dumps(session_data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
             os.makedirs(os.path.dirname(self.session_file), exist_ok=True)
-            with open(self.session_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
+
+            # Write a private temp file and rename it over the session, so a
+            # crash mid-write leaves the previous session intact
+            fd, tmp_file = tempfile.mkstemp(prefix='.session-', suffix='.tmp',
+                                            dir=os.path.dirname(self.session_file))
+            try:
+                with open(fd, 'wb') as f:
+                    f.write(data)
+                    if durable:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_file, self.session_file)
+            except BaseException:
+                os.unlink(tmp_file)
+                raise
+            return True
 
         except Exception as e:
             print(f"Error saving session: {e}")
+            return False
 
     def restore_session(self) -> Optional[Dict[str, Any]]:
         """Restore previous session from file."""
         try:
-            if not os.path.exists(self.session_file):
+            try:
+                f = open(self.session_file, 'rb')
+            except FileNotFoundError:
                 return None
 
-            # Check if file is empty
-            if os.path.getsize(self.session_file) == 0:
-                print("Session file is empty, starting fresh")
+            with f:
+                # Check if file is empty
+                if os.fstat(f.fileno()).st_size == 0:
+                    print("Session file is empty, starting fresh")
+                    return None
+                data = f.read()
+
+            # Bail out on another version before parsing the whole file
+            match = _VERSION_RE.search(data, 0, _VERSION_PEEK)
+            if match and match.group(1) != b"1.0":
+                print(f"Incompatible session version: {match.group(1).decode(errors='replace')}")
                 return None
 
-            with open(self.session_file, 'r') as f:
-                session_data = json.load(f)
+            session_data = _loads(data)
 
             # Check version compatibility
             if session_data.get("version") != "1.0":
@@ -71,13 +136,9 @@ class SessionManager:
 
             return session_data
 
-        except json.JSONDecodeError as e:
+        except ValueError as e:
+            # The next save replaces the file, so it is left as is
             print(f"Session file corrupted: {e}, starting fresh")
-            # Remove corrupted file
-            try:
-                os.remove(self.session_file)
-            except:
-                pass
             return None
         except Exception as e:
             print(f"Error restoring session: {e}")
@@ -85,6 +146,7 @@ class SessionManager:
 
     def clear_session(self):
         """Clear the saved session."""
+        self._last_saved = None
         try:
             if os.path.exists(self.session_file):
                 os.remove(self.session_file)
@@ -94,11 +156,13 @@ class SessionManager:
     def get_session_info(self) -> Dict[str, Any]:
         """Get information about the current session."""
         try:
-            if not os.path.exists(self.session_file):
+            try:
+                f = open(self.session_file, 'rb')
+            except FileNotFoundError:
                 return {"exists": False, "tabs": 0}
 
-            with open(self.session_file, 'r') as f:
-                session_data = json.load(f)
+            with f:
+                session_data = _loads(f.read())
 
             return {
                 "exists": True,
@@ -1,3 +1,4 @@
+"""
 NewTerm Tab Manager Module
 
 Copyright (C) 2024 NewTerm Team
@@ -20,21 +21,58 @@ import gi
 gi.require_version('Gtk', '3.0')
 gi.require_version('Vte', '2.91')
 from gi.repository import Gtk, Vte, GLib, Gdk, Pango
+import copy
 import os
 import signal
 import json
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, Iterator, List, Optional, Callable, Tuple
 from config import Config
 
+# Compiled notebook CSS per UI theme colors, shared by every window's notebook
+_NOTEBOOK_CSS_PROVIDERS: Dict[tuple, Gtk.CssProvider] = {}
+
+# Parsed colors and fonts shared by every tab; VTE copies them when applied
+_RGBA_POOL: Dict[str, Gdk.RGBA] = {}
+_FONT_POOL: Dict[tuple, Pango.FontDescription] = {}
+
+def _pooled_rgba(spec: str) -> Gdk.RGBA:
+    """Parse a color string once and reuse the result."""
+    rgba = _RGBA_POOL.get(spec)
+    if rgba is None:
+        rgba = _RGBA_POOL[spec] = Gdk.RGBA()
+        rgba.parse(spec)
+    return rgba
+
+def _pooled_font(family: str, size: int) -> Pango.FontDescription:
+    """Build a font description once per family and size."""
+    key = (family, size)
+    font_desc = _FONT_POOL.get(key)
+    if font_desc is None:
+        font_desc = _FONT_POOL[key] = Pango.FontDescription()
+        font_desc.set_family(family)
+        font_desc.set_size(size * Pango.SCALE)
+    return font_desc
+
 class TerminalTab:
     """Represents a single terminal tab."""
 
+    # One instance per open tab; no per-instance __dict__. __weakref__ stays
+    # so plugins handed a tab can still reference it weakly.
+    __slots__ = ('tab_manager', 'title', 'terminal', 'pid', 'working_directory', '_title_dirty',
+                 '_label_title', 'close_button', '__weakref__')
+
     def __init__(self, tab_manager, title: str = "Terminal"):
         self.tab_manager = tab_manager
         self.title = title
         self.terminal = Vte.Terminal()
         self.pid = None
         self.working_directory = os.environ.get('HOME', '/')
+        # Title label refresh already queued for the next idle cycle
+        self._title_dirty = False
+        # Text the tab label currently shows
+        self._label_title = title
+        # Close button in the tab's notebook label, set by TabManager.new_tab
+        self.close_button: Optional[Gtk.Button] = None
 
         # Configure terminal
         self.terminal.set_scrollback_lines(self.tab_manager.config.get('scrollback_lines', 1000))
@@ -50,48 +88,25 @@ class TerminalTab:
 
     def apply_theme(self):
         """Apply current theme to terminal."""
-        theme = self.tab_manager.config.get('theme', {})
-        bg = Gdk.RGBA()
-        bg.parse(theme.get('background_color', '#000000'))
+        theme = self.tab_manager._theme_cache
+        bg = theme['bg']
+        fg = theme['fg']
         self.terminal.set_color_background(bg)
-
-        fg = Gdk.RGBA()
-        fg.parse(theme.get('foreground_color', '#FFFFFF'))
         self.terminal.set_color_foreground(fg)
-
-        cursor = Gdk.RGBA()
-        cursor.parse(theme.get('cursor_color', '#FFFFFF'))
-        self.terminal.set_color_cursor(cursor)
+        self.terminal.set_color_cursor(theme['cursor'])
 
         # Palette
-        palette = []
-        for color in theme.get('palette', []):
-            rgba = Gdk.RGBA()
-            rgba.parse(color)
-            palette.append(rgba)
+        palette = theme['palette']
         if len(palette) == 16:
             self.terminal.set_colors(fg, bg, palette)
 
         # Font
-        font = self.tab_manager.config.get('font', {})
-        font_family = font.get('family', 'Monospace')
-        font_size = font.get('size', 12)
-        font_desc = Pango.FontDescription()
-        font_desc.set_family(font_family)
-        font_desc.set_size(font_size * Pango.SCALE)
-        self.terminal.set_font(font_desc)
+        self.terminal.set_font(theme['font'])
 
     def spawn_shell(self):
         """Spawn the shell process."""
         shell = os.environ.get('SHELL', '/bin/bash')
-
-        # Create environment variables
-        env = os.environ.copy()
-        env['TERM'] = 'xterm-256color'
-        env['COLORTERM'] = 'truecolor'
-
-        # Convert environment to the format expected by VTE
-        env_array = [f"{k}={v}" for k, v in env.items()]
+        env_array = self.tab_manager._base_env_array
 
         try:
             self.pid = self.terminal.spawn_sync(
@@ -130,7 +145,16 @@ class TerminalTab:
         title = self.terminal.get_window_title()
         if title:
             self.title = title
-            self.tab_manager.update_tab_title(self)
+            # A burst of title changes redraws the label once
+            if not self._title_dirty:
+                self._title_dirty = True
+                GLib.idle_add(self._flush_title)
+
+    def _flush_title(self) -> bool:
+        """Push the latest title to the tab label."""
+        self._title_dirty = False
+        self.tab_manager.update_tab_title(self)
+        return False
 
     def on_button_press(self, terminal, event):
         """Handle mouse button press events."""
@@ -141,32 +165,7 @@ class TerminalTab:
 
     def show_context_menu(self, event):
         """Show context menu for the tab."""
-        menu = Gtk.Menu()
-
-        # Copy
-        copy_item = Gtk.MenuItem(label="Copy")
-        copy_item.connect("activate", lambda x: self.terminal.copy_clipboard())
-        menu.append(copy_item)
-
-        # Paste
-        paste_item = Gtk.MenuItem(label="Paste")
-        paste_item.connect("activate", lambda x: self.terminal.paste_clipboard())
-        menu.append(paste_item)
-
-        menu.append(Gtk.SeparatorMenuItem())
-
-        # Close Tab
-        close_item = Gtk.MenuItem(label="Close Tab")
-        close_item.connect("activate", lambda x: self.tab_manager.close_tab(self))
-        menu.append(close_item)
-
-        # New Tab
-        new_tab_item = Gtk.MenuItem(label="New Tab")
-        new_tab_item.connect("activate", lambda x: self.tab_manager.new_tab())
-        menu.append(new_tab_item)
-
-        menu.show_all()
-        menu.popup_at_pointer(event)
+        self.tab_manager.show_context_menu(self, event)
 
     def get_terminal(self) -> Vte.Terminal:
         """Get the terminal widget."""
@@ -188,12 +187,88 @@ class TerminalTab:
 class TabManager:
     """Manages multiple terminal tabs."""
 
+    # How long shutdown() gives shells to exit, and how often it checks
+    SHUTDOWN_GRACE_MS = 1000
+    SHUTDOWN_POLL_MS = 50
+
     def __init__(self, config: Config):
         self.config = config
         self.tabs: List[TerminalTab] = []
         self.active_tab: Optional[TerminalTab] = None
         self.notebook: Optional[Gtk.Notebook] = None
-        self.tab_close_buttons: Dict[TerminalTab, Gtk.Button] = {}
+        # Tab CSS currently installed on the notebook's style context
+        self._notebook_css_provider: Optional[Gtk.CssProvider] = None
+        # Notebook page -> its tab, and each tab's title label
+        self._term_to_tab: Dict[Vte.Terminal, TerminalTab] = {}
+        self._tab_labels: Dict[TerminalTab, Gtk.Label] = {}
+        # Shell environment in the format expected by VTE, built once for all tabs
+        env = dict(os.environ, TERM='xterm-256color', COLORTERM='truecolor')
+        self._base_env_array: List[str] = [f"{k}={v}" for k, v in env.items()]
+        # Right-click menu shared by all tabs, built on first use
+        self._context_menu: Optional[Gtk.Menu] = None
+        self._context_tab: Optional[TerminalTab] = None
+        # Colors and font parsed once and shared by every tab
+        self._theme_cache: Dict[str, Any] = {}
+        self._theme_source: Optional[tuple] = None
+        self._rebuild_theme_cache()
+
+    def _rebuild_theme_cache(self):
+        """Parse the configured terminal colors and font if they changed."""
+        theme = self.config.get('theme', {})
+        font = self.config.get('font', {})
+        if self._theme_source == (theme, font):
+            return
+        self._theme_source = copy.deepcopy((theme, font))
+
+        self._theme_cache = {
+            'bg': _pooled_rgba(theme.get('background_color', '#000000')),
+            'fg': _pooled_rgba(theme.get('foreground_color', '#FFFFFF')),
+            'cursor': _pooled_rgba(theme.get('cursor_color', '#FFFFFF')),
+            'palette': [_pooled_rgba(color) for color in theme.get('palette', [])],
+            'font': _pooled_font(font.get('family', 'Monospace'), font.get('size', 12)),
+        }
+
+    def _build_context_menu(self) -> Gtk.Menu:
+        """Build the right-click menu; items act on the tab it was opened for."""
+        menu = Gtk.Menu()
+
+        # Copy
+        copy_item = Gtk.MenuItem(label="Copy")
+        copy_item.connect("activate", lambda x: self._context_tab.terminal.copy_clipboard())
+        menu.append(copy_item)
+
+        # Paste
+        paste_item = Gtk.MenuItem(label="Paste")
+        paste_item.connect("activate", lambda x: self._context_tab.terminal.paste_clipboard())
+        menu.append(paste_item)
+
+        menu.append(Gtk.SeparatorMenuItem())
+
+        # Close Tab
+        close_item = Gtk.MenuItem(label="Close Tab")
+        close_item.connect("activate", lambda x: self.close_tab(self._context_tab))
+        menu.append(close_item)
+
+        # New Tab
+        new_tab_item = Gtk.MenuItem(label="New Tab")
+        new_tab_item.connect("activate", lambda x: self.new_tab())
+        menu.append(new_tab_item)
+
+        menu.show_all()
+        return menu
+
+    def show_context_menu(self, tab: TerminalTab, event):
+        """Pop up the shared context menu for a tab."""
+        if self._context_menu is None:
+            self._context_menu = self._build_context_menu()
+        self._context_tab = tab
+        self._context_menu.popup_at_pointer(event)
+
+    def apply_theme(self):
+        """Re-parse the theme and apply it to every tab."""
+        self._rebuild_theme_cache()
+        for tab in self.tabs:
+            tab.apply_theme()
 
     def create_notebook(self) -> Gtk.Notebook:
         """Create the notebook widget for tabs."""
@@ -208,12 +283,14 @@ class TabManager:
             self.notebook.connect("page-removed", self.on_tab_removed)
 
             # Style the notebook with theme colors
-            self._apply_notebook_theme()
+            self.apply_ui_theme()
 
         return self.notebook
 
-    def _apply_notebook_theme(self):
-        """Apply theme colors to the notebook tabs."""
+    def apply_ui_theme(self):
+        """Apply the current UI theme colors to the notebook tabs."""
+        if self.notebook is None:
+            return
         ui_theme_name = self.config.get('ui_theme', 'Default')
         ui_themes = self.config.get('ui_themes', {})
         theme_colors = ui_themes.get(ui_theme_name, ui_themes.get('Default', {}))
@@ -221,6 +298,23 @@ class TabManager:
         if not theme_colors:
             return
 
+        key = tuple(sorted(theme_colors.items()))
+        css_provider = _NOTEBOOK_CSS_PROVIDERS.get(key)
+        if css_provider is None:
+            css_provider = _NOTEBOOK_CSS_PROVIDERS[key] = self._build_notebook_css(theme_colors)
+
+        if css_provider is self._notebook_css_provider:
+            return
+
+        # Swap the notebook's provider; it outranks the screen-wide UI theme CSS
+        style_context = self.notebook.get_style_context()
+        if self._notebook_css_provider is not None:
+            style_context.remove_provider(self._notebook_css_provider)
+        style_context.add_provider(css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+        self._notebook_css_provider = css_provider
+
+    def _build_notebook_css(self, theme_colors: Dict[str, str]) -> Gtk.CssProvider:
+        """Compile the notebook tab CSS for a set of UI theme colors."""
         # Create CSS with theme colors
         css = f"""
         .notebook tab {{
@@ -254,10 +348,9 @@ class TabManager:
         }}
         """
 
-        # Apply CSS to the notebook
         css_provider = Gtk.CssProvider()
         css_provider.load_from_data(css.encode())
-        self.notebook.get_style_context().add_provider(css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+        return css_provider
 
     def new_tab(self, title: str = "Terminal", directory: str = None) -> TerminalTab:
         """Create a new tab."""
@@ -287,7 +380,9 @@ class TabManager:
 
         # Store references
         self.tabs.append(tab)
-        self.tab_close_buttons[tab] = close_button
+        tab.close_button = close_button
+        self._term_to_tab[tab.get_terminal()] = tab
+        self._tab_labels[tab] = tab_label
 
         # Set as active if first tab
         if len(self.tabs) == 1:
@@ -300,7 +395,7 @@ class TabManager:
         if tab is None:
             tab = self.active_tab
 
-        if not tab:
+        if not tab or tab not in self._tab_labels:
             return False
 
         # Don't close if it's the last tab
@@ -310,16 +405,9 @@ class TabManager:
         # Find tab index
         page_num = self.notebook.page_num(tab.get_terminal())
 
-        # Remove from notebook
+        # Remove from notebook; on_tab_removed drops our references to it
         self.notebook.remove_page(page_num)
 
-        # Clean up
-        if tab in self.tabs:
-            self.tabs.remove(tab)
-
-        if tab in self.tab_close_buttons:
-            del self.tab_close_buttons[tab]
-
         # Kill process if still running
         if tab.pid:
             try:
@@ -328,15 +416,52 @@ class TabManager:
                 pass
 
         # Set new active tab
-        if self.tabs:
-            new_index = min(page_num, len(self.tabs) - 1)
-            self.set_active_tab(self.tabs[new_index])
+        n_pages = self.notebook.get_n_pages()
+        if n_pages:
+            page = self.notebook.get_nth_page(min(page_num, n_pages - 1))
+            self.set_active_tab(self._term_to_tab[page])
 
         return True
 
+    def shutdown(self, on_done: Optional[Callable[[], Any]] = None):
+        """Hang up every running shell, then call on_done once they have exited."""
+        running = [tab for tab in self.tabs if tab.pid]
+        # Interactive shells ignore SIGTERM; SIGHUP is what a closed terminal sends
+        for tab in running:
+            try:
+                os.kill(tab.pid, signal.SIGHUP)
+            except OSError:
+                pass
+
+        if not running:
+            if on_done is not None:
+                on_done()
+            return
+
+        # VTE reaps each shell and clears its pid; poll for that instead of
+        # calling waitpid ourselves, which would race GLib's child watches
+        deadline = GLib.get_monotonic_time() + self.SHUTDOWN_GRACE_MS * 1000
+        GLib.timeout_add(self.SHUTDOWN_POLL_MS, self._reap_shells, running, deadline, on_done)
+
+    def _reap_shells(self, running: List[TerminalTab], deadline: int,
+                     on_done: Optional[Callable[[], Any]]) -> bool:
+        """Wait for hung-up shells, killing any still alive at the deadline."""
+        running[:] = [tab for tab in running if tab.pid]
+        if running and GLib.get_monotonic_time() < deadline:
+            return True
+
+        for tab in running:
+            try:
+                os.kill(tab.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        if on_done is not None:
+            on_done()
+        return False
+
     def set_active_tab(self, tab: TerminalTab):
         """Set the active tab."""
-        if tab in self.tabs:
+        if tab in self._tab_labels:
             self.active_tab = tab
             page_num = self.notebook.page_num(tab.get_terminal())
             self.notebook.set_current_page(page_num)
@@ -347,43 +472,46 @@ class TabManager:
 
     def update_tab_title(self, tab: TerminalTab):
         """Update a tab's title in the UI."""
-        if tab in self.tab_close_buttons:
-            page_num = self.notebook.page_num(tab.get_terminal())
-            tab_label = self.notebook.get_tab_label(tab.get_terminal())
-            if tab_label:
-                children = tab_label.get_children()
-                if children:
-                    label = children[0]
-                    if isinstance(label, Gtk.Label):
-                        label.set_text(tab.get_title())
+        label = self._tab_labels.get(tab)
+        title = tab.get_title()
+        # Unchanged text would still cost a relayout
+        if label is not None and title != tab._label_title:
+            label.set_text(title)
+            tab._label_title = title
 
     def on_tab_switched(self, notebook, page, page_num):
         """Handle tab switching."""
-        if 0 <= page_num < len(self.tabs):
-            self.active_tab = self.tabs[page_num]
+        # Looked up by page widget, since reordering makes indexes diverge from self.tabs
+        tab = self._term_to_tab.get(page)
+        if tab is not None:
+            self.active_tab = tab
 
     def on_tab_removed(self, notebook, child, page_num):
         """Handle tab removal."""
         # Clean up references
-        for i, tab in enumerate(self.tabs):
-            if tab.get_terminal() == child:
-                if tab in self.tab_close_buttons:
-                    del self.tab_close_buttons[tab]
-                self.tabs.remove(tab)
-                break
+        tab = self._term_to_tab.pop(child, None)
+        if tab is not None:
+            self._tab_labels.pop(tab, None)
+            self.tabs.remove(tab)
+            if self._context_tab is tab:
+                self._context_tab = None
+
+    def get_tabs(self) -> Tuple[TerminalTab, ...]:
+        """Get a snapshot of all tabs."""
+        return tuple(self.tabs)
 
-    def get_tabs(self) -> List[TerminalTab]:
-        """Get all tabs."""
-        return self.tabs.copy()
+    def iter_tabs(self) -> Iterator[TerminalTab]:
+        """Iterate over the tabs without copying; don't open or close tabs meanwhile."""
+        return iter(self.tabs)
 
     def next_tab(self) -> bool:
         """Switch to next tab."""
         if not self.tabs or not self.active_tab:
             return False
 
-        current_index = self.tabs.index(self.active_tab)
-        next_index = (current_index + 1) % len(self.tabs)
-        self.set_active_tab(self.tabs[next_index])
+        # Cycle in on-screen order; switch-page updates active_tab
+        n_pages = self.notebook.get_n_pages()
+        self.notebook.set_current_page((self.notebook.get_current_page() + 1) % n_pages)
         return True
 
     def previous_tab(self) -> bool:
@@ -391,9 +519,9 @@ class TabManager:
         if not self.tabs or not self.active_tab:
             return False
 
-        current_index = self.tabs.index(self.active_tab)
-        prev_index = (current_index - 1) % len(self.tabs)
-        self.set_active_tab(self.tabs[prev_index])
+        # Cycle in on-screen order; switch-page updates active_tab
+        n_pages = self.notebook.get_n_pages()
+        self.notebook.set_current_page((self.notebook.get_current_page() - 1) % n_pages)
         return True
 
     def get_notebook(self) -> Gtk.Notebook: